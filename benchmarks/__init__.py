@@ -0,0 +1 @@
+"""Benchmarks for StudyFlow; run from the repository root with python -m benchmarks.<name>"""
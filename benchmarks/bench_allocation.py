@@ -0,0 +1,72 @@
+"""Study allocation cost and coverage for many courses
+
+Plans every study slot of the horizon with StudyPlan and reports the time
+taken, how many courses got any slots, and each course's share of the
+slots next to its share of the base weight.
+
+Usage:
+    python -m benchmarks.bench_allocation
+    python -m benchmarks.bench_allocation --courses 15 30 --days 120 365 --deadlines 300
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from studyflow_core.allocation import base_weight
+from studyflow_core.scheduling import make_study_plan
+
+from .bench_schedule import PREFERENCES, START_DATE
+
+TARGET_MS = 50.0
+
+
+def make_inputs(course_count, deadline_count, days, seed=0):
+    rng = random.Random(seed)
+    courses = [{'code': f'CRS {1100 + index}', 'name': f'Course {index}',
+                'difficulty': rng.randint(1, 5), 'credits': rng.choice([1, 3, 4])}
+               for index in range(course_count)]
+    deadlines = [{
+        'date': (START_DATE + timedelta(days=rng.randrange(days))).strftime('%Y-%m-%d'),
+        'title': f'Deadline {index}',
+        'course': courses[rng.randrange(course_count)]['code'],
+        'priority': rng.choice(['high', 'medium']),
+    } for index in range(deadline_count)]
+    return courses, deadlines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--courses', type=int, nargs='+', default=[5, 15, 50])
+    parser.add_argument('--days', type=int, nargs='+', default=[120, 365])
+    parser.add_argument('--deadlines', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--shares', action='store_true', help='print per-course slot shares')
+    args = parser.parse_args()
+
+    for course_count in args.courses:
+        for days in args.days:
+            courses, deadlines = make_inputs(course_count, args.deadlines, days)
+            best = float('inf')
+            plan = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                plan = make_study_plan(courses, deadlines, PREFERENCES, START_DATE)
+                plan.extend_to(START_DATE.toordinal() + days - 1)
+                best = min(best, time.perf_counter() - start)
+            totals = plan.totals()
+            slots = sum(totals.values())
+            covered = sum(1 for count in totals.values() if count)
+            flag = '' if best * 1000 < TARGET_MS else f'  OVER {TARGET_MS:.0f} ms'
+            print(f"{course_count:>3} courses {days:>4} days {args.deadlines:>5} deadlines  "
+                  f"{slots:>5} slots  {covered:>3}/{course_count} courses scheduled  "
+                  f"plan {best * 1000:>7.2f} ms{flag}", flush=True)
+            if args.shares:
+                total_weight = sum(base_weight(course) for course in courses)
+                for course in courses:
+                    print(f"      {course['code']:>9} weight share {base_weight(course) / total_weight:>6.1%}  "
+                          f"slot share {totals[course['code']] / slots:>6.1%}")
+
+
+if __name__ == '__main__':
+    main()
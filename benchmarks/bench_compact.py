@@ -0,0 +1,63 @@
+"""Memory per day of the dict layout versus CompactSchedule
+
+Generates the same schedule both ways, measures the memory each keeps
+alive with tracemalloc, and times a full pass over every activity (the
+compact store materializes dicts on the fly).
+
+Usage:
+    python -m benchmarks.bench_compact
+    python -m benchmarks.bench_compact --days 30 365 2000
+"""
+import argparse
+import time
+import tracemalloc
+
+from studyflow_core import generate_instant_schedule
+
+from .bench_schedule import PREFERENCES, START_DATE, make_inputs
+
+
+def retained_bytes(build):
+    """Return (object, bytes still allocated once build() returns)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def walk_ms(schedule):
+    start = time.perf_counter()
+    count = 0
+    for _, activities in schedule.items():
+        for activity in activities:
+            count += activity['duration'] >= 0
+    return (time.perf_counter() - start) * 1000, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 120, 365, 1000])
+    parser.add_argument('--courses', type=int, default=6)
+    parser.add_argument('--deadlines', type=int, default=300)
+    args = parser.parse_args()
+
+    courses, deadlines = make_inputs(args.deadlines, args.courses)
+    for days in args.days:
+        def build(compact):
+            return generate_instant_schedule(courses, deadlines, PREFERENCES, seed=0,
+                                             start_date=START_DATE, days=days, compact=compact)
+        plain, plain_bytes = retained_bytes(lambda: build(False))
+        compact, compact_bytes = retained_bytes(lambda: build(True))
+        plain_ms, plain_count = walk_ms(plain)
+        compact_ms, compact_count = walk_ms(compact)
+        assert plain_count == compact_count == compact.activity_count()
+        print(f"{days:>5} days {plain_count:>6} activities  "
+              f"dicts {plain_bytes / days / 1024:>6.2f} KiB/day  "
+              f"compact {compact_bytes / days / 1024:>5.2f} KiB/day ({plain_bytes / compact_bytes:>4.1f}x)  "
+              f"walk {plain_ms:>7.2f} -> {compact_ms:>7.2f} ms", flush=True)
+
+
+if __name__ == '__main__':
+    main()
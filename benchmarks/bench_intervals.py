@@ -0,0 +1,86 @@
+"""Conflict detection and free-time placement with many busy blocks
+
+Compares IntervalIndex.conflicts (one sorted sweep) with checking every
+pair, then times full schedules whose days carry hundreds of imported
+busy blocks.
+
+Usage:
+    python -m benchmarks.bench_intervals
+    python -m benchmarks.bench_intervals --blocks 100 1000 --days 120
+"""
+import argparse
+import random
+import time
+
+from studyflow_core import generate_instant_schedule
+from studyflow_core.intervals import IntervalIndex, find_conflicts
+
+from .bench_schedule import PREFERENCES, START_DATE, make_inputs
+
+
+def make_blocks(count, seed=0):
+    """Short weekly busy blocks scattered over the waking day"""
+    rng = random.Random(seed)
+    blocks = []
+    for index in range(count):
+        start = rng.randrange(7 * 60, 22 * 60)
+        blocks.append({'title': f'Shift {index}', 'start': start, 'end': start + rng.choice([10, 15, 30, 50]),
+                       'weekday': rng.randrange(7)})
+    return blocks
+
+
+def pairwise_conflicts(intervals):
+    pairs = []
+    for i, (start, end) in enumerate(intervals):
+        for other_start, other_end in intervals[i + 1:]:
+            if start < other_end and other_start < end:
+                pairs.append(((start, end), (other_start, other_end)))
+    return pairs
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--blocks', type=int, nargs='+', default=[100, 500, 2000])
+    parser.add_argument('--days', type=int, default=120)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    courses, deadlines = make_inputs(300)
+    for count in args.blocks:
+        blocks = make_blocks(count)
+        intervals = [(block['start'], block['end']) for block in blocks]
+        sweep_ms, pairs = best_of(lambda: IntervalIndex(interval + (interval,) for interval in intervals).conflicts(),
+                                  args.repeat)
+        naive_ms, naive_pairs = best_of(lambda: pairwise_conflicts(intervals), args.repeat)
+        assert len(pairs) == len(naive_pairs)
+
+        preferences = dict(PREFERENCES, busy_blocks=blocks)
+        schedule_ms, schedule = best_of(
+            lambda: generate_instant_schedule(courses, deadlines, preferences, seed=0, start_date=START_DATE,
+                                              days=args.days),
+            args.repeat
+        )
+        # Placed activities never overlap busy time or each other; only imported blocks may collide
+        placed_conflicts = sum(
+            1 for activities in schedule.values() for first, second in find_conflicts(activities)
+            if 'busy' not in (first['type'], second['type'])
+        )
+        studied = sum(1 for activities in schedule.values() for activity in activities if activity['type'] == 'study')
+        print(f"{count:>5} weekly blocks  conflicts {len(pairs):>6}  sweep {sweep_ms:>7.2f} ms  "
+              f"pairwise {naive_ms:>8.2f} ms  | {args.days} days {schedule_ms:>8.2f} ms "
+              f"({args.days / schedule_ms * 1000:>6,.0f} days/s)  study blocks {studied:>4}  "
+              f"placed overlaps {placed_conflicts}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
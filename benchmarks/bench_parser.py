@@ -0,0 +1,161 @@
+"""Extraction and parsing latency across synthetic syllabi
+
+Times extract_text and smart_parse_schedule separately for every
+format x pages x courses combination, reports p50/p90/p99 latency and peak
+traced memory per stage, and writes machine-readable JSON.
+
+Usage:
+    python -m benchmarks.bench_parser --output results.json
+    python -m benchmarks.bench_parser --pages 1 10 --courses 1 --formats txt
+    python -m benchmarks.bench_parser --compare before.json --output after.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from studyflow_core import PARSER_VERSION, extract_text, smart_parse_schedule
+
+from .corpus import FORMATS, make_syllabus
+
+DEFAULT_PAGES = [1, 10, 100, 500]
+DEFAULT_COURSES = [1, 10, 50]
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of an unsorted sample list"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def measure(func, repeat):
+    """Return (latencies in ms, peak traced KiB, last result)"""
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    # Memory is traced in a separate call so tracing overhead never skews timings
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latencies, peak / 1024, result
+
+
+def summarize(latencies, peak_kib):
+    return {
+        'runs': len(latencies),
+        'p50_ms': round(percentile(latencies, 0.50), 3),
+        'p90_ms': round(percentile(latencies, 0.90), 3),
+        'p99_ms': round(percentile(latencies, 0.99), 3),
+        'max_ms': round(max(latencies), 3),
+        'peak_kib': round(peak_kib, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(formats, pages_grid, courses_grid, repeat):
+    results = []
+    for file_format in formats:
+        for pages in pages_grid:
+            for courses in courses_grid:
+                data, mime_type = make_syllabus(file_format, pages, courses)
+                extract_ms, extract_peak, text = measure(lambda: extract_text(data, mime_type), repeat)
+                parse_ms, parse_peak, parsed = measure(lambda: smart_parse_schedule(text), repeat)
+                row = {
+                    'format': file_format,
+                    'pages': pages,
+                    'courses': courses,
+                    'bytes': len(data),
+                    'chars': len(text),
+                    'found_courses': len(parsed[0]),
+                    'found_deadlines': len(parsed[1]),
+                    'extract': summarize(extract_ms, extract_peak),
+                    'parse': summarize(parse_ms, parse_peak),
+                }
+                results.append(row)
+                print(
+                    f"{file_format:>5} {pages:>4}p {courses:>3}c  "
+                    f"extract p50 {row['extract']['p50_ms']:>9.2f} ms p99 {row['extract']['p99_ms']:>9.2f} ms "
+                    f"peak {row['extract']['peak_kib']:>9.0f} KiB | "
+                    f"parse p50 {row['parse']['p50_ms']:>8.2f} ms p99 {row['parse']['p99_ms']:>8.2f} ms "
+                    f"peak {row['parse']['peak_kib']:>7.0f} KiB",
+                    flush=True
+                )
+    return results
+
+
+def compare(baseline, results, threshold, min_delta_ms):
+    """Print per-stage p50 changes against a previous results file"""
+    previous = {(row['format'], row['pages'], row['courses']): row for row in baseline['results']}
+    regressions = 0
+    print(f"\nComparison against {baseline['meta'].get('revision') or 'baseline'} (p50):")
+    for row in results:
+        old = previous.get((row['format'], row['pages'], row['courses']))
+        if old is None:
+            continue
+        for stage in ('extract', 'parse'):
+            before, after = old[stage]['p50_ms'], row[stage]['p50_ms']
+            change = (after - before) / before if before else 0.0
+            flag = ''
+            if change > threshold and after - before > min_delta_ms:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{row['format']:>5} {row['pages']:>4}p {row['courses']:>3}c {stage:>8}: "
+                  f"{before:>9.2f} -> {after:>9.2f} ms ({change:+.0%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--pages', type=int, nargs='+', default=DEFAULT_PAGES)
+    parser.add_argument('--courses', type=int, nargs='+', default=DEFAULT_COURSES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write JSON results to this path')
+    parser.add_argument('--compare', help='previous JSON results to diff against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='relative p50 slowdown reported as a regression (default 0.2)')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='ignore slowdowns smaller than this many ms (default 1.0)')
+    args = parser.parse_args()
+
+    results = run(args.formats, args.pages, args.courses, args.repeat)
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'parser_version': PARSER_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), results, args.threshold, args.min_delta_ms)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
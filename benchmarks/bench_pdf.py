@@ -0,0 +1,129 @@
+"""Per-document PDF build time with the shared style registry
+
+Builds the same schedule PDF repeatedly, as a batch job for a roster
+would, once with the styles built a single time per process and once with
+the registry cleared before every document (what each document used to
+pay). Also reports the cost of building the styles on their own. Times
+are process CPU time, which is steadier than wall time on a busy machine.
+
+The second table renders whole horizons: the streaming fixed-grid renderer
+(generate_full_schedule_pdf) against the same days laid out as platypus
+tables, with the peak traced memory of each. The streaming renderer writes
+to a file, so its output is not counted; platypus has to hold the document
+in memory anyway.
+
+Usage:
+    python -m benchmarks.bench_pdf
+    python -m benchmarks.bench_pdf --rounds 30 --deadlines 10 80
+    python -m benchmarks.bench_pdf --full-days 30 120 365 730
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import date, datetime
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table
+
+from studyflow_core import LazySchedule, generate_full_schedule_pdf, generate_instant_schedule, generate_pdf_schedule
+from studyflow_core.exports import _pdf_styles
+
+from .bench_schedule import PREFERENCES, make_inputs
+
+
+def per_document_ms(build, documents, before=None):
+    start = time.process_time()
+    for _ in range(documents):
+        if before:
+            before()
+        build()
+    return (time.process_time() - start) * 1000 / documents
+
+
+def compare_ms(build, documents, rounds):
+    """Best per-document (rebuilt styles, shared styles) times
+
+    The two variants alternate in short runs so machine noise and drift hit
+    both alike.
+    """
+    cold = warm = float('inf')
+    for _ in range(rounds):
+        cold = min(cold, per_document_ms(build, documents, before=_pdf_styles.cache_clear))
+        warm = min(warm, per_document_ms(build, documents))
+    return cold, warm
+
+
+def platypus_full(schedule, user_data):
+    """Every day as a heading and table, the way generate_pdf_schedule lays out its week"""
+    styles = _pdf_styles()
+    buffer = BytesIO()
+    story = []
+    for date_str, activities in schedule.items():
+        day_name = datetime.strptime(date_str, '%Y-%m-%d').strftime('%A, %B %d')
+        story.append(Paragraph(day_name, styles['day_heading']))
+        rows = [[f"{activity['time']} - {activity['activity']}"] for activity in activities]
+        if rows:
+            table = Table(rows, colWidths=[5.5 * inch])
+            table.setStyle(styles['day_table'])
+            story.append(table)
+            story.append(Spacer(1, 12))
+    SimpleDocTemplate(buffer, pagesize=A4, invariant=True).build(story)
+    return buffer
+
+
+def streamed_full(schedule, user_data):
+    with open(os.devnull, 'wb') as sink:
+        generate_full_schedule_pdf(schedule, user_data, sink)
+
+
+def timed(render, make_schedule, user_data):
+    """(CPU ms, peak traced KiB) for one render of a freshly built LazySchedule"""
+    schedule = make_schedule()
+    start = time.process_time()
+    render(schedule, user_data)
+    elapsed = (time.process_time() - start) * 1000
+    schedule = make_schedule()
+    tracemalloc.start()
+    render(schedule, user_data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--documents', type=int, default=10, help='documents per timed run')
+    parser.add_argument('--rounds', type=int, default=15)
+    parser.add_argument('--deadlines', type=int, nargs='+', default=[10, 40])
+    parser.add_argument('--full-days', type=int, nargs='+', default=[30, 120, 365])
+    args = parser.parse_args()
+
+    styles_ms = per_document_ms(_pdf_styles.__wrapped__, 200)
+    print(f"style registry build {styles_ms:.3f} ms")
+    for count in args.deadlines:
+        # The PDF shows the week starting today, so the schedule must too
+        courses, deadlines = make_inputs(count, course_count=6, span_days=30)
+        schedule = generate_instant_schedule(courses, deadlines, PREFERENCES, start_date=date.today(), days=30)
+        user_data = dict(PREFERENCES, courses=courses, deadlines=deadlines)
+        build = lambda: generate_pdf_schedule(schedule, user_data)
+        build()
+        cold_ms, warm_ms = compare_ms(build, args.documents, args.rounds)
+        print(f"{count:>4} deadlines  rebuilt styles {cold_ms:>7.2f} ms/doc  shared styles {warm_ms:>7.2f} ms/doc  "
+              f"({1000 / warm_ms:>5.1f} docs/s, {(cold_ms - warm_ms) / cold_ms:>5.1%} saved)",
+              flush=True)
+
+    courses, deadlines = make_inputs(200, course_count=6, span_days=max(args.full_days))
+    user_data = dict(PREFERENCES, courses=courses, deadlines=deadlines)
+    for days in args.full_days:
+        make_schedule = lambda: LazySchedule(courses, deadlines, user_data, start_date=date(2024, 8, 26), days=days)
+        streamed_ms, streamed_kib = timed(streamed_full, make_schedule, user_data)
+        platypus_ms, platypus_kib = timed(platypus_full, make_schedule, user_data)
+        print(f"{days:>4} days  streamed {streamed_ms:>8.1f} ms {streamed_kib:>8,.0f} KiB peak  |  "
+              f"platypus {platypus_ms:>8.1f} ms {platypus_kib:>9,.0f} KiB peak", flush=True)
+
+
+if __name__ == '__main__':
+    main()
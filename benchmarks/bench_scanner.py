@@ -0,0 +1,123 @@
+"""Throughput of the single-pass course scanner against the old multi-pass parse
+
+Before timing, the scanner's output on the corpus is checked: its anchored
+walk must yield exactly the matches COURSE_PATTERN.finditer does, BIOLOGY
+syllabi must parse as they did with the legacy scan, and the fallback
+corpora must give the pinned EXPECTED results. A change to the patterns
+that alters what is found fails here rather than only showing up as a
+different throughput.
+
+Usage: python -m benchmarks.bench_scanner [--pages 10 100] [--repeat 5]
+"""
+import argparse
+import re
+import time
+
+from studyflow_core.scanner import COURSE_PATTERN, iter_course_matches, scan_courses
+
+from .corpus import syllabus_lines
+
+_LEGACY_PATTERNS = [
+    r'BIO\s*(\d{4})\s*[-:]?\s*([^:\n]{10,100})',
+    r'([A-Z]{2,4}[- ]?\d{3,4}[A-Z]?)\s*[-:]?\s*([^:\n]{10,80})',
+    r'Course:\s*([^:\n]+)',
+    r'([A-Z]{2,4}\s+\d{3,4})\s*[-:]?\s*([^:\n]+)',
+]
+
+
+def legacy_scan(text):
+    """Course detection as smart_parse_schedule did it before the scanner"""
+    seen, courses = set(), []
+    biology = re.findall(r'BIOLOGY\s+(\d{4})\s*[-:]?\s*([^:\n]{10,100})', text, re.IGNORECASE)
+    if biology:
+        for number, name in biology:
+            name = name.strip().replace('*', '').replace('Fall 2024', '').replace('Spring 2025', '').strip()
+            if name.startswith('- '):
+                name = name[2:]
+            if f'BIO{number}' not in seen:
+                seen.add(f'BIO{number}')
+                courses.append((f'BIO{number}', f'Biology {number} - {name}'))
+        return courses
+    for pattern in _LEGACY_PATTERNS:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            if len(match) != 2:
+                continue
+            if pattern.startswith('BIO'):
+                code, name = f'BIO{match[0]}', f'Biology {match[0]} - {match[1].strip()}'
+            else:
+                code, name = match[0].strip().upper(), match[1].strip()
+            name = name.replace('*', '').replace('Fall 2024', '').replace('Spring 2025', '').strip()
+            if name.startswith('- '):
+                name = name[2:]
+            if code not in seen and len(code) > 3 and not code.startswith('LOGY'):
+                seen.add(code)
+                courses.append((code, name))
+    return courses
+
+
+# scan_courses output for the fallback corpora; the old parser found junk
+# codes such as 'PORT 100' and 'ICAL 101' inside task lines as well
+EXPECTED = {
+    'fallback/10p': [('BIO1205', 'Biology 1205 - Lab report 2 due'), ('CHEM 1101', 'General Chemistry I')],
+    'fallback/100p': [
+        ('BIO1205', 'Biology 1205 - Lab report 2 due'), ('CHEM 1101', 'General Chemistry I'),
+        ('BIO120', '5 Exam 109'), ('PAGE 100', ')'),
+    ],
+    'courses/6': [
+        ('CHEM 1100', 'Homeostasis and feedback loops'), ('PHYS 1102', 'Lab report 2 due'),
+        ('ENG 1103', 'Lab report 3 due'), ('HIST 1104', 'Lab Practical 4'), ('PSY 1105', 'Quiz 5 on lecture notes'),
+        ('MATH 1101', 'Project milestone 7'),
+    ],
+}
+
+
+def corpora(pages):
+    """(label, text) pairs: a BIOLOGY syllabus and the same text with its header renamed"""
+    biology = '\n'.join(syllabus_lines(pages))
+    # Without a BIOLOGY header every fallback pattern runs in the old parser
+    mixed = biology.replace('BIOLOGY 1205 - Anatomy and Physiology I', 'CHEM 1101 - General Chemistry I')
+    return [(f'biology/{pages}p', biology), (f'fallback/{pages}p', mixed)]
+
+
+def check(label, text):
+    """Assert the scanner still finds what it should on one corpus text"""
+    anchored = [match.span() for match in iter_course_matches(text)]
+    assert anchored == [match.span() for match in COURSE_PATTERN.finditer(text)], \
+        f'{label}: anchored scan must match COURSE_PATTERN.finditer'
+    if label.startswith('biology/'):
+        assert scan_courses(text) == legacy_scan(text), f'{label}: BIOLOGY syllabi must parse as before'
+    if label in EXPECTED:
+        assert scan_courses(text) == EXPECTED[label], f'{label}: scanner output changed'
+
+
+def throughput(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return len(text.encode('utf-8')) / (1024 * 1024) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    check('courses/6', '\n'.join(syllabus_lines(10, courses=6)))
+    for pages in sorted(set(args.pages) | {10, 100}):
+        for label, text in corpora(pages):
+            check(label, text)
+
+    print(f"{'corpus':>20} {'MB':>7} {'legacy MB/s':>12} {'scanner MB/s':>13}")
+    for pages in args.pages:
+        for label, text in corpora(pages):
+            size = len(text.encode('utf-8')) / (1024 * 1024)
+            legacy = throughput(legacy_scan, text, args.repeat)
+            scanner = throughput(scan_courses, text, args.repeat)
+            print(f'{label:>20} {size:>7.2f} {legacy:>12.1f} {scanner:>13.1f}')
+
+
+if __name__ == '__main__':
+    main()
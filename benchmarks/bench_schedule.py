@@ -0,0 +1,117 @@
+"""Schedule generation cost as deadlines and the horizon grow
+
+Compares the old per-day scan of the whole deadline list against the
+date index generate_instant_schedule builds once, then times the full
+scheduler end to end. A second table reports generation throughput in
+days/second and compares building a whole horizon eagerly with a
+LazySchedule that only generates the 7-day preview.
+
+Usage:
+    python -m benchmarks.bench_schedule
+    python -m benchmarks.bench_schedule --deadlines 10000 --days 30 365
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from studyflow_core import LazySchedule, generate_instant_schedule
+
+START_DATE = datetime(2024, 8, 26)
+PREFERENCES = {'wake_time': 8, 'schedule_type': '⚖️ Balanced', 'attention_span': 25, 'include_breaks': True}
+
+
+def make_inputs(deadline_count, course_count=15, span_days=365, seed=0):
+    """Return (courses, deadlines) spread over span_days from START_DATE"""
+    rng = random.Random(seed)
+    courses = [{'code': f'CRS {1100 + index}', 'name': f'Course {index}', 'difficulty': 3, 'credits': 3}
+               for index in range(course_count)]
+    deadlines = []
+    for index in range(deadline_count):
+        due = START_DATE + timedelta(days=rng.randrange(span_days))
+        deadlines.append({
+            'id': str(index),
+            'title': f'Assignment {index}',
+            'date': due.strftime('%Y-%m-%d'),
+            'type': 'assignment',
+            'course': courses[index % course_count]['code'],
+            'priority': 'medium',
+        })
+    return courses, deadlines
+
+
+def legacy_placement(deadlines, days):
+    """The old O(days x deadlines) lookup"""
+    placed = 0
+    for i in range(days):
+        date_str = (START_DATE + timedelta(days=i)).strftime('%Y-%m-%d')
+        for deadline in deadlines:
+            if deadline['date'] == date_str:
+                placed += 1
+    return placed
+
+
+def indexed_placement(deadlines, days):
+    """The O(days + deadlines) lookup the scheduler uses"""
+    deadlines_by_date = defaultdict(list)
+    for deadline in deadlines:
+        deadlines_by_date[deadline['date']].append(deadline)
+    placed = 0
+    for i in range(days):
+        date_str = (START_DATE + timedelta(days=i)).strftime('%Y-%m-%d')
+        placed += len(deadlines_by_date.get(date_str, ()))
+    return placed
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--deadlines', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 120, 365])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for deadline_count in args.deadlines:
+        courses, deadlines = make_inputs(deadline_count)
+        for days in args.days:
+            legacy_ms, legacy_placed = best_of(lambda: legacy_placement(deadlines, days), args.repeat)
+            indexed_ms, indexed_placed = best_of(lambda: indexed_placement(deadlines, days), args.repeat)
+            assert legacy_placed == indexed_placed
+            schedule_ms, _ = best_of(
+                lambda: generate_instant_schedule(courses, deadlines, PREFERENCES, seed=0,
+                                                  start_date=START_DATE, days=days),
+                args.repeat
+            )
+            print(f"{deadline_count:>6} deadlines {days:>4} days  placed {indexed_placed:>6}  "
+                  f"legacy {legacy_ms:>9.2f} ms  indexed {indexed_ms:>7.2f} ms "
+                  f"({legacy_ms / indexed_ms:>6.1f}x)  full schedule {schedule_ms:>8.2f} ms", flush=True)
+
+    courses, deadlines = make_inputs(max(args.deadlines))
+    print()
+    for days in args.days:
+        eager_ms, _ = best_of(
+            lambda: generate_instant_schedule(courses, deadlines, PREFERENCES, seed=0,
+                                              start_date=START_DATE, days=days),
+            args.repeat
+        )
+
+        def preview():
+            schedule = LazySchedule(courses, deadlines, PREFERENCES, seed=0, start_date=START_DATE, days=days)
+            return [schedule[date_str] for date_str in list(schedule)[:7]]
+        lazy_ms, _ = best_of(preview, args.repeat)
+        print(f"{days:>4} day horizon  eager {eager_ms:>8.2f} ms ({days / eager_ms * 1000:>8,.0f} days/s)  "
+              f"lazy 7-day preview {lazy_ms:>6.2f} ms", flush=True)
+
+
+if __name__ == '__main__':
+    main()
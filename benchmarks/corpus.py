@@ -0,0 +1,102 @@
+"""Deterministic synthetic syllabi so benchmarks need no bundled binaries"""
+import random
+from io import BytesIO
+
+import docx
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from studyflow_core.extraction import DOCX_MIME, PDF_MIME
+
+LINES_PER_PAGE = 48
+FORMATS = ('txt', 'docx', 'pdf')
+MIME_TYPES = {'txt': 'text/plain', 'docx': DOCX_MIME, 'pdf': PDF_MIME}
+
+_DEPARTMENTS = ['CHEM', 'MATH', 'PHYS', 'ENG', 'HIST', 'PSY', 'ECON', 'CS', 'ART', 'SOC']
+_TOPICS = [
+    'Homeostasis and feedback loops', 'Cell structure and function', 'Integumentary system',
+    'Skeletal system and joints', 'Muscular system physiology', 'Endocrine signalling',
+    'Central nervous system', 'Peripheral nervous system', 'Special senses',
+]
+_TASKS = [
+    'Exam {n}: chapters {a}-{b}', 'Quiz {n} on lecture notes', 'Lab Practical {n}',
+    'Homework {n} due', 'Project milestone {n}', 'Lab report {n} due',
+]
+
+
+def course_headers(courses):
+    """Return (code, header line) pairs; a single course uses the BIOLOGY header"""
+    if courses == 1:
+        return [('BIO1205', 'BIOLOGY 1205 - Anatomy and Physiology I Fall 2024')]
+    headers = []
+    for index in range(courses):
+        code = f'{_DEPARTMENTS[index % len(_DEPARTMENTS)]} {1100 + index}'
+        headers.append((code, f'{code} - {_TOPICS[index % len(_TOPICS)]} Fall 2024'))
+    return headers
+
+
+def syllabus_lines(pages, courses=1, seed=0):
+    """Return syllabus-like text lines, LINES_PER_PAGE per page
+
+    Course headers are spread across the pages; roughly one line in six is a
+    dated assignment or exam, the rest are dated topic lines.
+    """
+    rng = random.Random(seed)
+    headers = course_headers(courses)
+    lines = []
+    task_number = 0
+    for page in range(pages):
+        lines.append(headers[page][1] if page < len(headers) else f'Course calendar (page {page + 1})')
+        for line in range(LINES_PER_PAGE - 1):
+            month, day = rng.randint(8, 12), rng.randint(1, 28)
+            if line % 6 == 5:
+                task_number += 1
+                code = headers[task_number % len(headers)][0]
+                task = rng.choice(_TASKS).format(n=task_number, a=line % 9 + 1, b=line % 9 + 2)
+                lines.append(f'{month}/{day}  {code} {task}')
+            else:
+                lines.append(f'{month}/{day}  Week {line % 15 + 1}: {rng.choice(_TOPICS)} - reading notes')
+    # More courses than pages: the remaining headers go on the last page
+    lines.extend(header for _, header in headers[pages:])
+    return lines
+
+
+def make_txt(pages, courses=1, seed=0):
+    return '\n'.join(syllabus_lines(pages, courses, seed)).encode('utf-8')
+
+
+def make_docx(pages, courses=1, seed=0):
+    """Build a .docx with one paragraph per line and a page break per page"""
+    document = docx.Document()
+    lines = syllabus_lines(pages, courses, seed)
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        for line in lines[start:start + LINES_PER_PAGE]:
+            document.add_paragraph(line)
+        if start + LINES_PER_PAGE < len(lines):
+            document.add_page_break()
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_pdf(pages, courses=1, seed=0):
+    """Render a text-heavy syllabus PDF with the given page count"""
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    lines = syllabus_lines(pages, courses, seed)
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        y = 750
+        for line in lines[start:start + LINES_PER_PAGE]:
+            pdf.drawString(40, y, line)
+            y -= 15
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+_BUILDERS = {'txt': make_txt, 'docx': make_docx, 'pdf': make_pdf}
+
+
+def make_syllabus(file_format, pages, courses=1, seed=0):
+    """Return (bytes, mime type) for a synthetic syllabus in the given format"""
+    return _BUILDERS[file_format](pages, courses, seed), MIME_TYPES[file_format]
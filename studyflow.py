@@ -1,22 +1,20 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-import re
-import PyPDF2
-import docx
-from io import BytesIO
-import json
-import uuid
-import random
+from datetime import date, datetime, timedelta
 import urllib.parse
 from collections import defaultdict
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import base64
+import os
+from studyflow_core import get_shared_parse_cache, content_key, extract_isolated, smart_parse_schedule, ExtractionFailed
+from studyflow_core import LazySchedule, horizon_through, content_id, get_default_catalog
+from studyflow_core import find_conflicts, read_busy_blocks
+from studyflow_core import get_export_prefetcher, get_shared_export_cache
+from studyflow_core.scheduling import MAX_HORIZON_DAYS
+from studyflow_core.extraction import MAX_PAGES, MAX_CHARS
+from studyflow_core.deadlines import academic_year
+
+# STUDYFLOW_DEBUG=1 adds a cache and prefetch stats panel under every step
+SHOW_DEBUG_STATS = os.environ.get('STUDYFLOW_DEBUG') == '1'
 
 # Page config
 st.set_page_config(
@@ -620,684 +618,17 @@ if 'schedule_ready' not in st.session_state:
     st.session_state.schedule_ready = False
 if 'final_schedule' not in st.session_state:
     st.session_state.final_schedule = None
-if 'pdf_generated' not in st.session_state:
-    st.session_state.pdf_generated = False
-if 'pdf_data' not in st.session_state:
-    st.session_state.pdf_data = None
+if 'requested_exports' not in st.session_state:
+    st.session_state.requested_exports = set()
+if 'extraction_failure' not in st.session_state:
+    st.session_state.extraction_failure = None
 
-def extract_text_from_file(file):
-    """Extract text from uploaded file"""
-    try:
-        if file.type == "application/pdf":
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        elif file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            doc = docx.Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        else:
-            return str(file.read(), "utf-8")
-    except:
-        return ""
-
-def smart_parse_schedule(text):
-    """AI-like parsing that extracts everything automatically"""
-    courses = []
-    deadlines = []
-    
-    # Track seen courses to avoid duplicates
-    seen_courses = set()
-    
-    # First, try to find BIOLOGY pattern specifically
-    biology_pattern = r'BIOLOGY\s+(\d{4})\s*[-:]?\s*([^:\n]{10,100})'
-    biology_matches = re.findall(biology_pattern, text, re.IGNORECASE)
-    
-    if biology_matches:
-        # Found BIOLOGY pattern, use it
-        for match in biology_matches:
-            code = f'BIO{match[0]}'
-            name = match[1].strip()
-            
-            # Clean up the name
-            name = name.replace('*', '').replace('Fall 2024', '').replace('Spring 2025', '').strip()
-            if name.startswith('- '):
-                name = name[2:]
-            
-            # Avoid duplicates
-            if code not in seen_courses:
-                seen_courses.add(code)
-                courses.append({
-                    'code': code,
-                    'name': f'Biology {match[0]} - {name}',
-                    'difficulty': 4,
-                    'credits': 4
-                })
-    else:
-        # Fallback to other patterns if BIOLOGY not found
-        course_patterns = [
-            r'BIO\s*(\d{4})\s*[-:]?\s*([^:\n]{10,100})',      # BIO1205 pattern
-            r'([A-Z]{2,4}[- ]?\d{3,4}[A-Z]?)\s*[-:]?\s*([^:\n]{10,80})',  # General course pattern
-            r'Course:\s*([^:\n]+)',
-            r'([A-Z]{2,4}\s+\d{3,4})\s*[-:]?\s*([^:\n]+)',
-        ]
-        
-        for pattern in course_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) == 2:
-                    # For BIO patterns, construct proper course code
-                    if pattern.startswith(r'BIO'):
-                        code = f'BIO{match[0]}'
-                        name = f'Biology {match[0]} - {match[1].strip()}'
-                    else:
-                        code = match[0].strip().upper()
-                        name = match[1].strip()
-                    
-                    # Clean up the name
-                    name = name.replace('*', '').replace('Fall 2024', '').replace('Spring 2025', '').strip()
-                    if name.startswith('- '):
-                        name = name[2:]
-                    
-                    # Avoid duplicates and filter out partial matches
-                    if code not in seen_courses and len(code) > 3 and not code.startswith('LOGY'):
-                        seen_courses.add(code)
-                        courses.append({
-                            'code': code,
-                            'name': name if name else f'{code} Course',
-                            'difficulty': 4 if 'BIO' in code else random.randint(3, 5),
-                            'credits': 4 if 'BIO' in code else random.randint(3, 4)
-                        })
-                elif len(match) == 1:
-                    code = f'BIO{match[0]}'
-                    if code not in seen_courses:
-                        seen_courses.add(code)
-                        courses.append({
-                            'code': code,
-                            'name': f'Biology {match[0]}',
-                            'difficulty': 4,
-                            'credits': 4
-                        })
-    
-    # Enhanced deadline extraction for Biology syllabus
-    exam_dates = [
-        ('9/13', 'Exam I: Homeostasis, Comp of Living Matter, Cell Structure and Function'),
-        ('9/27', 'Exam II: Cell Structure and Function'),
-        ('10/11', 'Exam III: Integument and Skeletal System'),
-        ('11/8', 'Exam IV: Muscular System'),
-        ('11/22', 'Exam V: Endocrine System'),
-        ('12/14', 'Exam VI: Nervous System'),
-    ]
-    
-    # Add the major exams
-    for date_str, title in exam_dates:
-        try:
-            month, day = map(int, date_str.split('/'))
-            year = 2024 if month >= 8 else 2025
-            formatted_date = f"{year}-{month:02d}-{day:02d}"
-            
-            deadlines.append({
-                'id': str(uuid.uuid4()),
-                'title': title,
-                'date': formatted_date,
-                'type': 'exam',
-                'course': 'BIO1205',
-                'priority': 'high'
-            })
-        except:
-            continue
-    
-    # Add lab practicals
-    lab_practicals = [
-        ('10/7', 'Lab Practical I: Skeletal System'),
-        ('11/4', 'Lab Practical II: Muscular System'),
-        ('12/2', 'Lab Practical III: Nervous System'),
-    ]
-    
-    for date_str, title in lab_practicals:
-        try:
-            month, day = map(int, date_str.split('/'))
-            year = 2024 if month >= 8 else 2025
-            formatted_date = f"{year}-{month:02d}-{day:02d}"
-            
-            deadlines.append({
-                'id': str(uuid.uuid4()),
-                'title': title,
-                'date': formatted_date,
-                'type': 'practical',
-                'course': 'BIO1205',
-                'priority': 'high'
-            })
-        except:
-            continue
-    
-    # Add lab safety and other assignments
-    other_assignments = [
-        ('8/31', 'Lab Safety Online Lab'),
-        ('9/5', 'Connect LearnSmart Labs'),
-        ('9/6', 'Practice Exam'),
-    ]
-    
-    for date_str, title in other_assignments:
-        try:
-            month, day = map(int, date_str.split('/'))
-            year = 2024 if month >= 8 else 2025
-            formatted_date = f"{year}-{month:02d}-{day:02d}"
-            
-            deadlines.append({
-                'id': str(uuid.uuid4()),
-                'title': title,
-                'date': formatted_date,
-                'type': 'assignment',
-                'course': 'BIO1205',
-                'priority': 'medium'
-            })
-        except:
-            continue
-    
-    # If no courses found through patterns, create default Biology course
-    if not courses:
-        courses.append({
-            'code': 'BIO1205',
-            'name': 'Biology 1205 Lecture and Laboratory',
-            'difficulty': 4,
-            'credits': 4
-        })
-    
-    return courses, deadlines
-
-def generate_instant_schedule(courses, deadlines, preferences):
-    """Generate a beautiful, realistic schedule instantly"""
-    schedule = {}
-    
-    # Generate next 30 days
-    for i in range(30):
-        date = datetime.now() + timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        day_name = date.strftime('%A')
-        is_weekend = date.weekday() >= 5
-        
-        daily_schedule = []
-        
-        # Morning routine
-        wake_time = preferences.get('wake_time', 8)
-        daily_schedule.append({
-            'time': f'{wake_time}:00 AM',
-            'activity': '🌅 Morning Routine',
-            'type': 'routine',
-            'emoji': '🌅',
-            'duration': 60
-        })
-        
-        # Meals
-        daily_schedule.extend([
-            {'time': f'{wake_time + 1}:00 AM', 'activity': '🥞 Breakfast', 'type': 'meal', 'emoji': '🥞', 'duration': 30},
-            {'time': '12:30 PM', 'activity': '🍽️ Lunch Break', 'type': 'meal', 'emoji': '🍽️', 'duration': 60},
-            {'time': '6:00 PM', 'activity': '🍕 Dinner', 'type': 'meal', 'emoji': '🍕', 'duration': 60},
-        ])
-        
-        # Study sessions based on schedule type
-        schedule_type = preferences.get('schedule_type', '⚖️ Balanced')
-        if '🔥 Intense' in schedule_type:
-            study_slots = ['10:00 AM', '2:00 PM', '4:00 PM', '7:30 PM', '9:00 PM']
-        elif '⚖️ Balanced' in schedule_type:
-            study_slots = ['10:00 AM', '2:00 PM', '4:00 PM', '7:30 PM']
-        else:  # Chill
-            study_slots = ['10:00 AM', '2:00 PM', '7:30 PM']
-        
-        # Reduce study sessions on weekends
-        if is_weekend:
-            study_slots = study_slots[:-1]
-        
-        for i, slot in enumerate(study_slots):
-            if i < len(courses):
-                course = courses[i % len(courses)]
-                session_types = ['Review', 'Practice', 'Reading', 'Problems', 'Notes']
-                session_type = random.choice(session_types)
-                
-                daily_schedule.append({
-                    'time': slot,
-                    'activity': f"📚 {course['code']} - {session_type}",
-                    'type': 'study',
-                    'emoji': '📚',
-                    'course': course['code'],
-                    'duration': preferences.get('attention_span', 25)
-                })
-        
-        # Social media breaks
-        if preferences.get('include_breaks', True):
-            daily_schedule.extend([
-                {'time': '11:00 AM', 'activity': '📱 Social Break', 'type': 'break', 'emoji': '📱', 'duration': 15},
-                {'time': '3:00 PM', 'activity': '📱 TikTok Break', 'type': 'break', 'emoji': '📱', 'duration': 15},
-            ])
-        
-        # Evening activities
-        if is_weekend:
-            daily_schedule.append({
-                'time': '8:00 PM',
-                'activity': '🎉 Weekend Social Time',
-                'type': 'free',
-                'emoji': '🎉',
-                'duration': 180
-            })
-        else:
-            daily_schedule.append({
-                'time': '9:00 PM',
-                'activity': '🎮 Gaming/Netflix',
-                'type': 'free',
-                'emoji': '🎮',
-                'duration': 120
-            })
-        
-        # Add deadline reminders
-        for deadline in deadlines:
-            if deadline['date'] == date_str:
-                daily_schedule.append({
-                    'time': '11:59 PM',
-                    'activity': f"⚠️ DUE: {deadline['title']}",
-                    'type': 'deadline',
-                    'emoji': '⚠️',
-                    'priority': 'high',
-                    'course': deadline['course'],
-                    'duration': 0
-                })
-        
-        # Sort by time
-        def time_sort_key(activity):
-            try:
-                time_str = activity['time']
-                if 'AM' in time_str or 'PM' in time_str:
-                    time_obj = datetime.strptime(time_str, '%I:%M %p')
-                    return time_obj.hour * 60 + time_obj.minute
-                else:
-                    return 0
-            except:
-                return 0
-        
-        daily_schedule.sort(key=time_sort_key)
-        schedule[date_str] = daily_schedule
-    
-    return schedule
-
-def generate_pdf_schedule(schedule_data, user_data):
-    """Generate a beautiful PDF schedule"""
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-    
-    # Create custom styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#6c5ce7')
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'CustomSubtitle',
-        parent=styles['Normal'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=TA_CENTER,
-        textColor=colors.HexColor('#a29bfe')
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        textColor=colors.HexColor('#6c5ce7')
-    )
-    
-    # Build the story
-    story = []
-    
-    # Title
-    story.append(Paragraph("⚡ StudyFlow Schedule", title_style))
-    story.append(Paragraph("Your Personalized Study Schedule", subtitle_style))
-    story.append(Spacer(1, 12))
-    
-    # Summary section
-    courses = user_data.get('courses', [])
-    deadlines = user_data.get('deadlines', [])
-    
-    summary_data = [
-        ['📚 Total Courses', str(len(courses))],
-        ['⚠️ Upcoming Deadlines', str(len(deadlines))],
-        ['⏰ Daily Study Sessions', '3-4 sessions'],
-        ['🎯 Focus Time', f"{user_data.get('attention_span', 25)} minutes"],
-        ['📅 Schedule Type', user_data.get('schedule_type', 'Balanced')],
-        ['🗓️ Generated On', datetime.now().strftime('%B %d, %Y')]
-    ]
-    
-    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9ff')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-        ('TOPPADDING', (0, 0), (-1, -1), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e0e6ff'))
-    ]))
-    
-    story.append(summary_table)
-    story.append(Spacer(1, 20))
-    
-    # Courses section
-    if courses:
-        story.append(Paragraph("📚 Your Courses", heading_style))
-        course_data = [['Course Code', 'Course Name', 'Difficulty', 'Credits']]
-        for course in courses:
-            difficulty_stars = '⭐' * course.get('difficulty', 3)
-            course_data.append([
-                course['code'],
-                course['name'][:40] + '...' if len(course['name']) > 40 else course['name'],
-                difficulty_stars,
-                str(course.get('credits', 3))
-            ])
-        
-        course_table = Table(course_data, colWidths=[1.5*inch, 2.5*inch, 1*inch, 0.8*inch])
-        course_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6c5ce7')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9ff')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e0e6ff'))
-        ]))
-        
-        story.append(course_table)
-        story.append(Spacer(1, 20))
-    
-    # Deadlines section
-    if deadlines:
-        story.append(Paragraph("⚠️ Upcoming Deadlines", heading_style))
-        deadline_data = [['Date', 'Assignment', 'Course', 'Type', 'Priority']]
-        sorted_deadlines = sorted(deadlines, key=lambda x: x['date'])
-        
-        for deadline in sorted_deadlines:
-            priority_symbol = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}.get(deadline.get('priority', 'medium'), '🟡')
-            deadline_data.append([
-                deadline['date'],
-                deadline['title'][:30] + '...' if len(deadline['title']) > 30 else deadline['title'],
-                deadline.get('course', 'N/A'),
-                deadline.get('type', 'assignment').title(),
-                priority_symbol
-            ])
-        
-        deadline_table = Table(deadline_data, colWidths=[1*inch, 2*inch, 1*inch, 1*inch, 0.8*inch])
-        deadline_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fd79a8')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff8f8')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#ffe0e0'))
-        ]))
-        
-        story.append(deadline_table)
-        story.append(Spacer(1, 20))
-    
-    # Weekly schedule
-    story.append(Paragraph("📅 This Week's Schedule", heading_style))
-    
-    # Show 7 days starting from today
-    today = datetime.now()
-    for i in range(7):
-        date = today + timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        day_name = date.strftime('%A, %B %d')
-        
-        if date_str in schedule_data:
-            story.append(Paragraph(f"📅 {day_name}", ParagraphStyle(
-                'DayHeading',
-                parent=styles['Heading3'],
-                fontSize=14,
-                spaceAfter=6,
-                textColor=colors.HexColor('#6c5ce7')
-            )))
-            
-            daily_schedule = schedule_data[date_str]
-            schedule_items = []
-            
-            for activity in daily_schedule:
-                activity_text = f"{activity['time']} - {activity['activity']}"
-                if activity.get('duration'):
-                    activity_text += f" ({activity['duration']} min)"
-                schedule_items.append(activity_text)
-            
-            # Create schedule table for the day
-            day_data = [[item] for item in schedule_items]
-            if day_data:
-                day_table = Table(day_data, colWidths=[5.5*inch])
-                day_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9ff')),
-                    ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                    ('TOPPADDING', (0, 0), (-1, -1), 6),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e0e6ff'))
-                ]))
-                
-                story.append(day_table)
-                story.append(Spacer(1, 12))
-        
-        # Add page break after 4 days
-        if i == 3:
-            story.append(PageBreak())
-    
-    # Footer
-    story.append(Spacer(1, 30))
-    story.append(Paragraph(
-        "Generated by StudyFlow - Your AI-Powered Study Scheduler",
-        ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor('#666666')
-        )
-    ))
-    
-    # Build PDF
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
-
-def generate_ics_calendar(schedule_data, user_data):
-    """Generate ICS calendar file"""
-    ics_content = f"""BEGIN:VCALENDAR
-VERSION:2.0
-PRODID:-//StudyFlow//StudyFlow 2025//EN
-CALSCALE:GREGORIAN
-METHOD:PUBLISH
-X-WR-CALNAME:StudyFlow Schedule
-X-WR-TIMEZONE:America/New_York
-BEGIN:VTIMEZONE
-TZID:America/New_York
-X-LIC-LOCATION:America/New_York
-BEGIN:DAYLIGHT
-TZOFFSETFROM:-0500
-TZOFFSETTO:-0400
-TZNAME:EDT
-DTSTART:20240310T020000
-RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU
-END:DAYLIGHT
-BEGIN:STANDARD
-TZOFFSETFROM:-0400
-TZOFFSETTO:-0500
-TZNAME:EST
-DTSTART:20241103T020000
-RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU
-END:STANDARD
-END:VTIMEZONE
-"""
-    
-    for date_str, activities in schedule_data.items():
-        for activity in activities:
-            if activity['type'] in ['study', 'deadline', 'meal']:
-                event_id = str(uuid.uuid4())
-                event_date = datetime.strptime(date_str, '%Y-%m-%d')
-                
-                try:
-                    # Parse time
-                    time_str = activity['time']
-                    if 'AM' in time_str or 'PM' in time_str:
-                        time_obj = datetime.strptime(time_str, '%I:%M %p')
-                        start_datetime = event_date.replace(
-                            hour=time_obj.hour,
-                            minute=time_obj.minute,
-                            second=0,
-                            microsecond=0
-                        )
-                    else:
-                        start_datetime = event_date.replace(hour=9, minute=0)
-                    
-                    # Duration
-                    duration_minutes = activity.get('duration', 30)
-                    if duration_minutes == 0:  # Deadlines
-                        duration_minutes = 15
-                    
-                    end_datetime = start_datetime + timedelta(minutes=duration_minutes)
-                    
-                    # Format for ICS
-                    start_str = start_datetime.strftime('%Y%m%dT%H%M%S')
-                    end_str = end_datetime.strftime('%Y%m%dT%H%M%S')
-                    
-                    # Clean activity name for ICS
-                    activity_name = activity['activity'].replace('\n', ' ').replace('\r', ' ')
-                    
-                    # Set category and description
-                    category = activity['type'].upper()
-                    description = f"StudyFlow Event\\nType: {activity['type']}\\nDuration: {duration_minutes} minutes"
-                    
-                    if activity.get('course'):
-                        description += f"\\nCourse: {activity['course']}"
-                    
-                    ics_content += f"""BEGIN:VEVENT
-UID:{event_id}@studyflow.app
-DTSTART;TZID=America/New_York:{start_str}
-DTEND;TZID=America/New_York:{end_str}
-SUMMARY:{activity_name}
-DESCRIPTION:{description}
-CATEGORIES:{category}
-STATUS:CONFIRMED
-TRANSP:OPAQUE
-END:VEVENT
-"""
-                except Exception as e:
-                    continue
-    
-    ics_content += "END:VCALENDAR"
-    return ics_content
-
-def create_email_content_with_attachment_instructions(schedule_data, user_data):
-    """Create email content with PDF attachment instructions"""
-    courses = user_data.get('courses', [])
-    deadlines = user_data.get('deadlines', [])
-    
-    subject = "Your StudyFlow Schedule is Ready! ⚡ (PDF Attached)"
-    
-    body = f"""Hey there! 👋
-
-Your personalized StudyFlow schedule is ready! I've attached the PDF for easy reference.
-
-📊 YOUR SCHEDULE STATS:
-• {len(courses)} courses tracked
-• {len(deadlines)} deadlines managed
-• {user_data.get('attention_span', 25)}-minute focus blocks (perfect for your attention span!)
-• {user_data.get('schedule_type', 'Balanced')} intensity level
-
-📚 YOUR COURSES:
-"""
-    
-    for course in courses:
-        body += f"• {course['code']} - {course['name']} (Difficulty: {course.get('difficulty', 3)}/5)\n"
-    
-    if deadlines:
-        body += f"""
-⚠️ UPCOMING DEADLINES:
-"""
-        sorted_deadlines = sorted(deadlines, key=lambda x: x['date'])
-        for deadline in sorted_deadlines:
-            priority_emoji = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}.get(deadline.get('priority', 'medium'), '🟡')
-            body += f"• {deadline['date']}: {deadline['title']} ({deadline.get('course', 'N/A')}) {priority_emoji}\n"
-    
-    body += f"""
-📅 THIS WEEK'S PREVIEW:
-"""
-    
-    # Add preview of next 3 days
-    today = datetime.now()
-    for i in range(3):
-        date = today + timedelta(days=i)
-        date_str = date.strftime('%Y-%m-%d')
-        day_name = date.strftime('%A, %B %d')
-        
-        if date_str in schedule_data:
-            body += f"\n{day_name}:\n"
-            daily_schedule = schedule_data[date_str]
-            
-            for activity in daily_schedule[:6]:  # Show first 6 activities
-                body += f"  {activity['time']} - {activity['activity']}\n"
-            
-            if len(daily_schedule) > 6:
-                body += f"  ... and {len(daily_schedule) - 6} more activities\n"
-    
-    body += f"""
-
-📎 ATTACHED FILES:
-• StudyFlow_Schedule.pdf - Your complete schedule for printing and reference
-• StudyFlow_Calendar.ics - Import this into your phone's calendar app
-
-🎯 WHY THIS SCHEDULE WORKS:
-✅ Realistic {user_data.get('attention_span', 25)}-minute study blocks
-✅ Built-in social media breaks (because we're human!)
-✅ Flexible enough for your actual college life
-✅ AI-powered optimization based on your courses
-✅ Accounts for procrastination (we get it!)
-
-💡 PRO TIPS:
-• Print the PDF and put it on your dorm wall
-• Import the calendar file to your phone for notifications
-• Use your phone breaks wisely - set timers!
-• Study groups are great for accountability
-• Your evening social time is protected - balance is key!
-
-📱 NEXT STEPS:
-1. Print the attached PDF for offline reference
-2. Import the calendar file to your phone
-3. Start with just ONE study block today
-4. Adjust as needed - this is YOUR schedule!
-
-🔥 You've got this! Your future self will thank you for taking control of your schedule.
-
-Generated by StudyFlow - Built for Real College Students
-StudyFlow.app
-
-P.S. Share this with your friends - they need better schedules too! 📤
-
----
-REMINDER: Don't forget to manually attach the PDF file before sending!
-"""
-    
-    return subject, body
+def extract_uploaded_file(uploaded_file):
+    """Extract text in an isolated worker so a bad PDF can't pin the server"""
+    result = extract_isolated(uploaded_file.getvalue(), uploaded_file.type, MAX_PAGES, MAX_CHARS)
+    if result.failure:
+        raise ExtractionFailed(result.failure)
+    return result.text
 
 # Main App Logic
 def main():
@@ -1318,8 +649,25 @@ def main():
     elif st.session_state.step == 3:
         show_schedule_step()
     
+    if SHOW_DEBUG_STATS:
+        show_debug_stats()
+    
     st.markdown("</div>", unsafe_allow_html=True)
 
+def show_debug_stats():
+    """Hit rates of the process-wide caches and the export prefetcher"""
+    sections = (
+        ("Parse cache", get_shared_parse_cache().stats()),
+        ("Export cache", get_shared_export_cache().stats()),
+        ("Export prefetcher", get_export_prefetcher().stats()),
+    )
+    with st.expander("🛠️ Cache stats"):
+        cols = st.columns(len(sections))
+        for col, (label, stats) in zip(cols, sections):
+            with col:
+                st.metric(label, f"{stats['hit_rate']:.0%} hits")
+                st.json(stats, expanded=False)
+
 def show_upload_step():
     """Step 1: Smart file upload with instant parsing"""
     st.markdown("""
@@ -1347,8 +695,8 @@ def show_upload_step():
                     {'code': 'STUDY201', 'name': 'Advanced Study Skills', 'difficulty': 4, 'credits': 3}
                 ],
                 'deadlines': [
-                    {'id': str(uuid.uuid4()), 'title': 'First Assignment', 'date': '2024-12-20', 'type': 'assignment', 'course': 'DEMO101', 'priority': 'medium'},
-                    {'id': str(uuid.uuid4()), 'title': 'Final Exam', 'date': '2024-12-25', 'type': 'exam', 'course': 'STUDY201', 'priority': 'high'}
+                    {'id': content_id('DEMO101', '2024-12-20', 'First Assignment'), 'title': 'First Assignment', 'date': '2024-12-20', 'type': 'assignment', 'course': 'DEMO101', 'priority': 'medium'},
+                    {'id': content_id('STUDY201', '2024-12-25', 'Final Exam'), 'title': 'Final Exam', 'date': '2024-12-25', 'type': 'exam', 'course': 'STUDY201', 'priority': 'high'}
                 ]
             }
             st.session_state.step = 2
@@ -1357,8 +705,31 @@ def show_upload_step():
     with col2:
         if uploaded_file:
             with st.spinner("🧠 AI is reading your document..."):
-                text = extract_text_from_file(uploaded_file)
-                courses, deadlines = smart_parse_schedule(text)
+                # Shared across sessions: a class uploading the same syllabus parses it once
+                catalog = get_default_catalog()
+                file_key = content_key(uploaded_file.getvalue(), MAX_PAGES, MAX_CHARS)
+                failure = st.session_state.extraction_failure
+                failure = failure[1] if failure and failure[0] == file_key else None
+                if failure is None:
+                    # Undated years follow the current academic year, which is part of the key
+                    reference_date = date.today()
+                    try:
+                        courses, deadlines = get_shared_parse_cache().get_or_parse(
+                            uploaded_file.getvalue(),
+                            lambda: extract_uploaded_file(uploaded_file),
+                            lambda text: smart_parse_schedule(text, catalog=catalog, reference_date=reference_date),
+                            MAX_PAGES,
+                            MAX_CHARS,
+                            catalog.fingerprint if catalog else None,
+                            academic_year(reference_date)
+                        )
+                    except ExtractionFailed as e:
+                        # Failures stay out of the shared cache; remember them for this session only
+                        # so reruns don't wait out the timeout again
+                        failure = e.reason
+                        st.session_state.extraction_failure = (file_key, failure)
+                if failure is not None:
+                    courses, deadlines = [], []
                 
                 # Auto-generate some courses if none found
                 if not courses:
@@ -1369,8 +740,8 @@ def show_upload_step():
                 
                 if not deadlines:
                     deadlines = [
-                        {'id': str(uuid.uuid4()), 'title': 'Assignment 1', 'date': '2024-12-20', 'type': 'assignment', 'course': courses[0]['code'], 'priority': 'medium'},
-                        {'id': str(uuid.uuid4()), 'title': 'Midterm Exam', 'date': '2024-12-25', 'type': 'exam', 'course': courses[0]['code'], 'priority': 'high'}
+                        {'id': content_id(courses[0]['code'], '2024-12-20', 'Assignment 1'), 'title': 'Assignment 1', 'date': '2024-12-20', 'type': 'assignment', 'course': courses[0]['code'], 'priority': 'medium'},
+                        {'id': content_id(courses[0]['code'], '2024-12-25', 'Midterm Exam'), 'title': 'Midterm Exam', 'date': '2024-12-25', 'type': 'exam', 'course': courses[0]['code'], 'priority': 'high'}
                     ]
                 
                 st.session_state.user_data = {
@@ -1378,6 +749,9 @@ def show_upload_step():
                     'deadlines': deadlines
                 }
                 
+                if failure is not None:
+                    st.warning(f"⚠️ We couldn't read this document ({failure}) - starting you off with sample courses.")
+                
                 # Show what we found
                 st.success(f"✅ Found {len(courses)} courses and {len(deadlines)} deadlines!")
                 
@@ -1400,26 +774,52 @@ def show_preferences_step():
     </div>
     """, unsafe_allow_html=True)
     
+    # Start from the previous answers so "Modify Schedule" changes only what the user touches
+    saved = st.session_state.user_data
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("**⏰ Your Schedule**")
-        wake_time = st.slider("Wake up time", 6, 11, 8, format="%d:00")
-        sleep_time = st.slider("Bedtime", 10, 2, 11, format="%d:00")
+        wake_time = st.slider("Wake up time", 6, 11, saved.get('wake_time', 8), format="%d:00")
+        sleep_time = st.slider("Bedtime", 10, 2, saved.get('sleep_time', 11), format="%d:00")
         
         st.markdown("**📱 Study Style**")
-        attention_span = st.slider("Focus time (minutes)", 15, 60, 25)
-        procrastination = st.slider("Procrastination buffer", 20, 80, 40, format="%d%%")
+        attention_span = st.slider("Focus time (minutes)", 15, 60, saved.get('attention_span', 25))
+        procrastination = st.slider("Procrastination buffer", 20, 80, saved.get('procrastination', 40), format="%d%%")
     
     with col2:
         st.markdown("**🎯 Preferences**")
+        schedule_types = ["🌿 Chill (2-3 study blocks)", "⚖️ Balanced (3-4 study blocks)", "🔥 Intense (4-5 study blocks)"]
         schedule_type = st.selectbox(
             "Schedule intensity",
-            ["🌿 Chill (2-3 study blocks)", "⚖️ Balanced (3-4 study blocks)", "🔥 Intense (4-5 study blocks)"]
+            schedule_types,
+            index=schedule_types.index(saved['schedule_type']) if saved.get('schedule_type') in schedule_types else 0
         )
         
-        include_breaks = st.checkbox("Include social media breaks", value=True)
-        include_meals = st.checkbox("Include meal times", value=True)
+        include_breaks = st.checkbox("Include social media breaks", value=saved.get('include_breaks', True))
+        include_meals = st.checkbox("Include meal times", value=saved.get('include_meals', True))
+        
+        # Default to planning through the last known deadline (finals)
+        horizon_days = st.slider(
+            "Days to plan", 7, MAX_HORIZON_DAYS,
+            saved.get('horizon_days') or horizon_through(saved.get('deadlines', []), datetime.now()),
+            help="Days are built as you view or export them, so long plans stay fast"
+        )
+    
+    # Classes, work shifts and other fixed commitments to plan around
+    busy_file = st.file_uploader(
+        "📅 Import classes or work shifts (optional)",
+        type=['csv', 'json'],
+        help="Columns: title, day (e.g. Mon/Wed/Fri or 2024-09-12), start, end (e.g. 14:30)"
+    )
+    busy_blocks = saved.get('busy_blocks', [])
+    if busy_file is not None:
+        try:
+            busy_blocks = read_busy_blocks(busy_file.getvalue(), busy_file.name)
+            st.caption(f"{len(busy_blocks)} busy blocks imported")
+        except Exception as e:
+            st.warning(f"Couldn't read {busy_file.name}: {e}")
     
     # Progress indicator
     st.markdown("""
@@ -1438,17 +838,24 @@ def show_preferences_step():
             'procrastination': procrastination,
             'schedule_type': schedule_type,
             'include_breaks': include_breaks,
-            'include_meals': include_meals
+            'include_meals': include_meals,
+            'horizon_days': horizon_days,
+            'busy_blocks': busy_blocks
         })
         
-        # Generate schedule
+        # Generate schedule; when only preferences changed, update the existing one in place
         with st.spinner("🎨 Creating your personalized schedule..."):
-            schedule = generate_instant_schedule(
-                st.session_state.user_data['courses'],
-                st.session_state.user_data['deadlines'],
-                st.session_state.user_data
-            )
+            schedule = st.session_state.final_schedule
+            courses = st.session_state.user_data['courses']
+            deadlines = st.session_state.user_data['deadlines']
+            if isinstance(schedule, LazySchedule) and schedule.same_inputs(courses, deadlines):
+                schedule.update_preferences(st.session_state.user_data, days=horizon_days)
+            else:
+                schedule = LazySchedule(courses, deadlines, st.session_state.user_data, days=horizon_days)
             st.session_state.final_schedule = schedule
+            st.session_state.requested_exports = set()
+            # PDF, calendar and JSON start building in the background while step 3 renders
+            get_export_prefetcher().prefetch(schedule, st.session_state.user_data)
             st.session_state.step = 3
             st.rerun()
 
@@ -1481,7 +888,7 @@ def show_schedule_step():
             <div class="stat-label">Min Focus</div>
         </div>
         <div class="stat-card">
-            <span class="stat-number">30</span>
+            <span class="stat-number">{len(st.session_state.final_schedule or {})}</span>
             <div class="stat-label">Days Planned</div>
         </div>
     </div>
@@ -1499,8 +906,22 @@ def show_schedule_step():
             day_name = date.strftime('%A, %B %d')
             
             if date_str in st.session_state.final_schedule:
-                with st.expander(f"{'🔥 Today' if i == 0 else '📅'} {day_name}", expanded=(i == 0)):
-                    daily_schedule = st.session_state.final_schedule[date_str]
+                schedule = st.session_state.final_schedule
+                locked = schedule.is_locked(date_str)
+                with st.expander(f"{'🔥 Today' if i == 0 else '📅'} {day_name}{' 🔒' if locked else ''}", expanded=(i == 0)):
+                    # Locked days keep their activities when preferences are modified
+                    if st.checkbox("🔒 Lock this day", value=locked, key=f"lock_{date_str}") != locked:
+                        if locked:
+                            schedule.unlock_day(date_str)
+                        else:
+                            schedule.lock_day(date_str)
+                        st.rerun()
+                    daily_schedule = schedule[date_str]
+                    conflicts = find_conflicts(daily_schedule)
+                    if conflicts:
+                        st.caption("⚠️ Overlaps: " + "; ".join(
+                            f"{first['activity']} / {second['activity']}" for first, second in conflicts[:3]
+                        ))
                     
                     for activity in daily_schedule:
                         # Color coding based on activity type
@@ -1537,35 +958,61 @@ def show_schedule_step():
     # Create export files
     if st.session_state.final_schedule and st.session_state.user_data:
         
-        # Generate PDF and ICS
-        pdf_buffer = generate_pdf_schedule(st.session_state.final_schedule, st.session_state.user_data)
-        pdf_data = pdf_buffer.getvalue()
-        ics_content = generate_ics_calendar(st.session_state.final_schedule, st.session_state.user_data)
+        # Exports prefetched in the background show up as downloads once built; the
+        # rest are built when asked for, and reruns after that hit the export cache
+        requested = st.session_state.requested_exports
+        prefetcher = get_export_prefetcher()
         
-        # Store PDF data in session state for email workflow
-        st.session_state.pdf_data = pdf_data
-        st.session_state.pdf_generated = True
+        def export(kind):
+            return prefetcher.result(kind, st.session_state.final_schedule, st.session_state.user_data)
+        
+        def available(kind):
+            return kind in requested or prefetcher.ready(kind, st.session_state.final_schedule, st.session_state.user_data)
+        
+        building = [label for kind, label in (('pdf', 'PDF'), ('ics', 'calendar'), ('json', 'saved data'))
+                    if prefetcher.pending(kind, st.session_state.final_schedule, st.session_state.user_data)]
+        if building:
+            st.caption(f"⏳ Preparing your {', '.join(building)} in the background - Prepare picks it up when done")
+        
+        # The styled PDF covers this week; the full one lists every planned day on a compact grid
+        pdf_layout = st.radio(
+            "PDF layout",
+            ["📄 This week", f"🗓️ Full schedule ({len(st.session_state.final_schedule)} days)"],
+            horizontal=True,
+            help="The full schedule prints every planned day in a compact two-column layout"
+        )
+        pdf_kind = 'pdf' if pdf_layout == "📄 This week" else 'pdf_full'
+        pdf_file_name = (f"StudyFlow_Schedule_{'' if pdf_kind == 'pdf' else 'Full_'}"
+                         f"{datetime.now().strftime('%Y%m%d')}.pdf")
         
         # Export buttons row 1: PDF and Calendar
         col1, col2 = st.columns(2)
         
         with col1:
-            st.download_button(
-                label="📄 Download PDF",
-                data=pdf_data,
-                file_name=f"StudyFlow_Schedule_{datetime.now().strftime('%Y%m%d')}.pdf",
-                mime="application/pdf",
-                help="Download a beautifully formatted PDF of your schedule"
-            )
+            if available(pdf_kind):
+                st.download_button(
+                    label="📄 Download PDF",
+                    data=export(pdf_kind),
+                    file_name=pdf_file_name,
+                    mime="application/pdf",
+                    help="Download a beautifully formatted PDF of your schedule"
+                )
+            elif st.button("📄 Prepare PDF", help="Build a beautifully formatted PDF of your schedule"):
+                requested.add(pdf_kind)
+                st.rerun()
         
         with col2:
-            st.download_button(
-                label="📅 Download Calendar",
-                data=ics_content,
-                file_name=f"StudyFlow_Calendar_{datetime.now().strftime('%Y%m%d')}.ics",
-                mime="text/calendar",
-                help="Import this into Google Calendar, Outlook, or Apple Calendar"
-            )
+            if available('ics'):
+                st.download_button(
+                    label="📅 Download Calendar",
+                    data=export('ics'),
+                    file_name=f"StudyFlow_Calendar_{datetime.now().strftime('%Y%m%d')}.ics",
+                    mime="text/calendar",
+                    help="Import this into Google Calendar, Outlook, or Apple Calendar"
+                )
+            elif st.button("📅 Prepare Calendar", help="Build a calendar file for Google Calendar, Outlook, or Apple Calendar"):
+                requested.add('ics')
+                st.rerun()
         
         # Enhanced email section with attachment workflow
         st.markdown("""
@@ -1585,10 +1032,9 @@ def show_schedule_step():
         if st.button("📧 Create Email with PDF Instructions", type="primary", disabled=not email_input):
             if email_input:
                 # Create email content with attachment instructions
-                email_subject, email_body = create_email_content_with_attachment_instructions(
-                    st.session_state.final_schedule, 
-                    st.session_state.user_data
-                )
+                email_subject, email_body = export('email')
+                # The email walks through attaching both files
+                requested.update((pdf_kind, 'ics'))
                 
                 # Create mailto link
                 mailto_url = f"mailto:{email_input}?subject={urllib.parse.quote(email_subject)}&body={urllib.parse.quote(email_body)}"
@@ -1637,14 +1083,14 @@ def show_schedule_step():
                     with col_a:
                         st.download_button(
                             label="📄 Download PDF (for attachment)",
-                            data=pdf_data,
-                            file_name=f"StudyFlow_Schedule_{datetime.now().strftime('%Y%m%d')}.pdf",
+                            data=export(pdf_kind),
+                            file_name=pdf_file_name,
                             mime="application/pdf"
                         )
                     with col_b:
                         st.download_button(
                             label="📅 Download Calendar (for attachment)",
-                            data=ics_content,
+                            data=export('ics'),
                             file_name=f"StudyFlow_Calendar_{datetime.now().strftime('%Y%m%d')}.ics",
                             mime="text/calendar"
                         )
@@ -1663,21 +1109,17 @@ def show_schedule_step():
         
         with col2:
             # Save current data as JSON for future use
-            save_data = {
-                'courses': st.session_state.user_data.get('courses', []),
-                'deadlines': st.session_state.user_data.get('deadlines', []),
-                'preferences': st.session_state.user_data,
-                'schedule': st.session_state.final_schedule,
-                'generated_date': datetime.now().isoformat()
-            }
-            
-            st.download_button(
-                label="💾 Save Data",
-                data=json.dumps(save_data, indent=2),
-                file_name=f"StudyFlow_Data_{datetime.now().strftime('%Y%m%d')}.json",
-                mime="application/json",
-                help="Save your data to import later"
-            )
+            if available('json'):
+                st.download_button(
+                    label="💾 Save Data",
+                    data=export('json'),
+                    file_name=f"StudyFlow_Data_{datetime.now().strftime('%Y%m%d')}.json",
+                    mime="application/json",
+                    help="Save your data to import later"
+                )
+            elif st.button("💾 Prepare Save Data", help="Bundle your data to import later"):
+                requested.add('json')
+                st.rerun()
     
     # Progress complete
     st.markdown("""
@@ -1695,7 +1137,7 @@ def show_schedule_step():
     ✅ **{deadlines_count} deadlines** tracked with smart reminders
     ✅ **{attention_span}-minute focus sessions** (perfect for your attention span!)
     ✅ **Social media breaks** included (because we're realistic!)
-    ✅ **30 days** of personalized scheduling
+    ✅ **{len(st.session_state.final_schedule)} days** of personalized scheduling
     ✅ **PDF & Calendar** ready for download and email attachment
     
     📱 **Follow the email steps above to send your schedule with PDF attached!**
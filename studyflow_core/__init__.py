@@ -0,0 +1,62 @@
+"""UI-free building blocks used by the StudyFlow Streamlit app"""
+from .cache import (ExportCache, LRUCache, ParseCache, PARSER_VERSION, content_key, get_shared_export_cache,
+                    get_shared_parse_cache)
+from .compact import CompactSchedule
+from .busy import read_busy_blocks
+from .catalog import CourseCatalog, get_default_catalog
+from .deadlines import extract_deadlines
+from .determinism import content_id, derive_seed, seeded_random
+from .exports import (cached_export, create_email_content_with_attachment_instructions, generate_ics_calendar,
+                      generate_pdf_schedule)
+from .extraction import extract_pdf_text_parallel, extract_text, extract_text_from_file, iter_text_chunks
+from .intervals import FreeTime, IntervalIndex, find_conflicts
+from .isolation import ExtractionFailed, ExtractionResult, extract_isolated
+from .parsing import smart_parse_schedule
+from .pdf_canvas import generate_full_schedule_pdf
+from .prefetch import ExportPrefetcher, get_export_prefetcher
+from .scanner import scan_courses
+from .scheduling import LazySchedule, generate_instant_schedule, horizon_through
+from .timemodel import activity_start, format_minutes, parse_time_label
+
+__all__ = [
+    'CompactSchedule',
+    'CourseCatalog',
+    'ExportCache',
+    'ExportPrefetcher',
+    'ExtractionFailed',
+    'ExtractionResult',
+    'FreeTime',
+    'IntervalIndex',
+    'LRUCache',
+    'LazySchedule',
+    'ParseCache',
+    'PARSER_VERSION',
+    'activity_start',
+    'cached_export',
+    'content_id',
+    'content_key',
+    'create_email_content_with_attachment_instructions',
+    'derive_seed',
+    'extract_deadlines',
+    'extract_isolated',
+    'extract_pdf_text_parallel',
+    'extract_text',
+    'extract_text_from_file',
+    'find_conflicts',
+    'format_minutes',
+    'generate_full_schedule_pdf',
+    'generate_ics_calendar',
+    'generate_instant_schedule',
+    'generate_pdf_schedule',
+    'get_default_catalog',
+    'get_export_prefetcher',
+    'get_shared_export_cache',
+    'get_shared_parse_cache',
+    'horizon_through',
+    'iter_text_chunks',
+    'parse_time_label',
+    'read_busy_blocks',
+    'scan_courses',
+    'seeded_random',
+    'smart_parse_schedule',
+]
@@ -0,0 +1,138 @@
+"""Deadline-aware allocation of study slots to courses
+
+The study budget is the number of study slots in the horizon. It is spread
+across courses by stride scheduling: each course has a weight, a course
+that gets a slot moves its pass value forward by 1 / weight, and the next
+slot goes to the course with the lowest pass value, taken from a heap. Over
+time every course receives slots in proportion to its weight. Nobody is
+starved, however many courses there are.
+
+A weight is difficulty x credits x urgency. Urgency rises from 1 as the
+course's next deadline comes within URGENCY_WINDOW_DAYS, and exams and
+other high-priority deadlines rise further. The next deadline is found by
+bisecting the course's sorted deadline days. Pass values carry from one day
+to the next, so the plan is computed once, in date order, for the whole
+horizon. Each slot costs O(log courses).
+"""
+import heapq
+from bisect import bisect_left
+from datetime import date as date_type, datetime
+
+URGENCY_WINDOW_DAYS = 14
+URGENCY_BOOST = {'high': 3.0, 'medium': 1.5, 'low': 0.5}
+DEFAULT_DIFFICULTY = 3
+DEFAULT_CREDITS = 3
+
+
+def _ordinal(value):
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = date_type.fromisoformat(value)
+    return value.toordinal()
+
+
+def base_weight(course):
+    """Difficulty x credits, with defaults for courses missing either"""
+    return (course.get('difficulty') or DEFAULT_DIFFICULTY) * (course.get('credits') or DEFAULT_CREDITS)
+
+
+def urgency(days_until, priority):
+    """Multiplier for a deadline days_until away (1.0 outside the window)"""
+    if days_until is None or days_until >= URGENCY_WINDOW_DAYS:
+        return 1.0
+    closeness = (URGENCY_WINDOW_DAYS - days_until) / URGENCY_WINDOW_DAYS
+    return 1.0 + URGENCY_BOOST.get(priority, URGENCY_BOOST['medium']) * closeness
+
+
+class StudyPlan:
+    """Course assignments for every study slot from start_date onward
+
+    slot_count(date) returns how many study slots that date has. Days are
+    allocated in order the first time a date at or after the furthest
+    planned day is asked for. Dates before start_date are allocated on
+    their own, from fresh pass values.
+    """
+
+    def __init__(self, courses, deadlines, slot_count, start_date):
+        self.courses = list(courses)
+        self.slot_count = slot_count
+        self.start = _ordinal(start_date)
+        self._base = [base_weight(course) for course in self.courses]
+        index = {course['code']: position for position, course in enumerate(self.courses)}
+        # Per course: sorted deadline days and the priority of the strongest deadline on each
+        due = [dict() for _ in self.courses]
+        ordinals = {}
+        for deadline in deadlines:
+            position = index.get(deadline.get('course'))
+            if position is None:
+                continue
+            date_str = deadline.get('date')
+            day = ordinals.get(date_str)
+            if day is None:
+                try:
+                    day = ordinals[date_str] = _ordinal(date_str)
+                except (TypeError, ValueError):
+                    continue
+            priority = deadline.get('priority', 'medium')
+            current = due[position].get(day)
+            if current is None or URGENCY_BOOST.get(priority, 0) > URGENCY_BOOST.get(current, 0):
+                due[position][day] = priority
+        self._due_days = [sorted(days) for days in due]
+        self._due_priority = due
+        self._passes = [0.0] * len(self.courses)
+        self._plan = []
+
+    def weights(self, day):
+        """Effective weight of every course on an ordinal day"""
+        weights = []
+        for position, base in enumerate(self._base):
+            days = self._due_days[position]
+            next_index = bisect_left(days, day)
+            if next_index < len(days):
+                due_day = days[next_index]
+                weights.append(base * urgency(due_day - day, self._due_priority[position][due_day]))
+            else:
+                weights.append(base)
+        return weights
+
+    def _allocate_day(self, day, slots, passes):
+        if not self.courses or slots <= 0:
+            return []
+        weights = self.weights(day)
+        heap = [(passes[position], position) for position in range(len(self.courses))]
+        heapq.heapify(heap)
+        chosen = []
+        for _ in range(slots):
+            current, position = heapq.heappop(heap)
+            chosen.append(position)
+            current += 1.0 / weights[position]
+            passes[position] = current
+            heapq.heappush(heap, (current, position))
+        return chosen
+
+    def extend_to(self, day):
+        """Allocate every day up to and including the ordinal day"""
+        while self.start + len(self._plan) <= day:
+            planned = self.start + len(self._plan)
+            slots = self.slot_count(date_type.fromordinal(planned))
+            self._plan.append(self._allocate_day(planned, slots, self._passes))
+
+    def courses_for(self, value):
+        """Courses assigned to the study slots of one date, in slot order"""
+        day = _ordinal(value)
+        if day < self.start:
+            slots = self.slot_count(date_type.fromordinal(day))
+            positions = self._allocate_day(day, slots, [0.0] * len(self.courses))
+        else:
+            self.extend_to(day)
+            positions = self._plan[day - self.start]
+        return [self.courses[position] for position in positions]
+
+    def totals(self):
+        """Slots allocated so far per course code"""
+        counts = {course['code']: 0 for course in self.courses}
+        for positions in self._plan:
+            for position in positions:
+                counts[self.courses[position]['code']] += 1
+        return counts
@@ -0,0 +1,393 @@
+"""Headless schedule generation for a whole roster
+
+Reads a manifest of students, each with syllabus files and preferences.
+Every student is processed in a worker process: text extraction, then
+smart_parse_schedule, then generate_instant_schedule. Each student's
+schedule is written to <output-dir>/<student_id>.json (plus .ics, .pdf and
+_full.pdf with --formats). Only a small summary travels back to the parent,
+and at most --max-pending students are submitted at once, so memory stays
+flat however long the roster is.
+Bad manifest rows, unreadable files and workers that die are recorded in
+summary.json as failed students rather than stopping the run. Student IDs
+that sanitize to the same file name get a short hash of the raw ID.
+Syllabi shared by a class are parsed once per worker through the shared
+parse cache; summary.json reports its hits and misses across all workers.
+
+Manifest formats:
+  CSV   student_id, files ('a.pdf;b.docx', relative to the manifest), and
+        optional wake_time, sleep_time, schedule_type, attention_span,
+        include_breaks, days, start_date, busy_file columns
+  JSON  [{"student_id": ..., "files": [...], "preferences": {...}}, ...]
+
+Usage:
+    python -m studyflow_core.batch roster.csv --output-dir schedules --workers 4
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+
+from .busy import read_busy_blocks
+from .cache import get_shared_parse_cache
+from .catalog import get_default_catalog
+from .deadlines import academic_year
+from .exports import generate_ics_calendar, generate_pdf_schedule
+from .pdf_canvas import generate_full_schedule_pdf
+from .extraction import DOCX_MIME, MAX_CHARS, MAX_PAGES, PDF_MIME, process_context
+from .isolation import ExtractionFailed, extract_isolated
+from .parsing import smart_parse_schedule
+from .scheduling import HORIZON_DAYS, generate_instant_schedule
+
+MIME_TYPES = {'.pdf': PDF_MIME, '.docx': DOCX_MIME, '.txt': 'text/plain'}
+SCHEDULE_TYPES = {
+    'chill': '🌿 Chill (2-3 study blocks)',
+    'balanced': '⚖️ Balanced (3-4 study blocks)',
+    'intense': '🔥 Intense (4-5 study blocks)',
+}
+_INT_FIELDS = ('wake_time', 'sleep_time', 'attention_span', 'days')
+_UNSAFE_NAME = re.compile(r'[^A-Za-z0-9_.-]+')
+FORMATS = ('json', 'ics', 'pdf', 'pdf_full')
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y')
+
+
+def _normalize_job(row, base_dir, index):
+    """Return a job dict from a manifest row (CSV strings or JSON values)"""
+    preferences = dict(row.get('preferences') or {})
+    for key, value in row.items():
+        if key not in ('student_id', 'files', 'preferences') and value not in (None, ''):
+            preferences.setdefault(key, value)
+    for field in _INT_FIELDS:
+        if field in preferences:
+            preferences[field] = int(preferences[field])
+    if 'include_breaks' in preferences:
+        preferences['include_breaks'] = _as_bool(preferences['include_breaks'])
+    schedule_type = str(preferences.get('schedule_type', '')).strip().lower()
+    if schedule_type in SCHEDULE_TYPES:
+        preferences['schedule_type'] = SCHEDULE_TYPES[schedule_type]
+
+    files = row.get('files') or []
+    if isinstance(files, str):
+        files = [part.strip() for part in files.split(';') if part.strip()]
+    busy_file = preferences.pop('busy_file', None)
+    return {
+        'student_id': str(row.get('student_id') or f'student-{index + 1}'),
+        'files': [os.path.join(base_dir, path) for path in files],
+        'busy_file': os.path.join(base_dir, busy_file) if busy_file else None,
+        'preferences': preferences,
+    }
+
+
+def read_manifest(path):
+    """Yield job dicts from a CSV or JSON manifest
+
+    Each job carries its 1-based manifest 'row'. A row that can't be read,
+    or repeats an earlier student_id, is yielded as {'row', 'student_id',
+    'error'} so the run records it and carries on.
+    """
+    base_dir = os.path.dirname(os.path.abspath(path))
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if path.lower().endswith('.json'):
+        rows = json.loads(data.decode('utf-8'))
+    else:
+        rows = csv.DictReader(io.StringIO(data.decode('utf-8-sig')))
+    first_rows = {}
+    for index, row in enumerate(rows):
+        try:
+            job = _normalize_job(row, base_dir, index)
+        except Exception as e:
+            student_id = row.get('student_id') if isinstance(row, dict) else None
+            yield {'row': index + 1, 'student_id': str(student_id or f'student-{index + 1}'),
+                   'error': f'manifest row {index + 1}: {e}'}
+            continue
+        student_id = job['student_id']
+        if student_id in first_rows:
+            yield {'row': index + 1, 'student_id': student_id,
+                   'error': f'manifest row {index + 1}: duplicate student_id (first on row {first_rows[student_id]})'}
+            continue
+        first_rows[student_id] = index + 1
+        yield dict(job, row=index + 1)
+
+
+def _merge(parsed):
+    """Combine per-file (courses, deadlines), keeping the first of each code and ID"""
+    courses, deadlines = [], []
+    seen_codes, seen_ids = set(), set()
+    for file_courses, file_deadlines in parsed:
+        for course in file_courses:
+            if course['code'] not in seen_codes:
+                seen_codes.add(course['code'])
+                courses.append(course)
+        for deadline in file_deadlines:
+            if deadline['id'] not in seen_ids:
+                seen_ids.add(deadline['id'])
+                deadlines.append(deadline)
+    return courses, deadlines
+
+
+def _output_name(student_id, used):
+    """File name stem for a student, unique among those already in used
+
+    used holds lower-cased stems (file systems may ignore case) and is
+    updated. A stem and its '_full' variant are claimed together, since
+    pdf_full writes <stem>_full.pdf.
+    """
+    def taken(stem):
+        return stem.lower() in used or f'{stem}_full'.lower() in used
+
+    base = _UNSAFE_NAME.sub('_', student_id) or 'student'
+    if taken(base):
+        base = f"{base}-{hashlib.sha1(student_id.encode('utf-8')).hexdigest()[:8]}"
+    name, suffix = base, 2
+    while taken(name):
+        name, suffix = f'{base}-{suffix}', suffix + 1
+    used.update((name.lower(), f'{name}_full'.lower()))
+    return name
+
+
+def _failed(job, error):
+    return {'row': job.get('row'), 'student_id': job['student_id'], 'ok': False, 'failures': [], 'error': error, 'elapsed': 0.0}
+
+
+def _extract(data, mime_type):
+    # Students already run one per core, so each file is read serially in its own worker
+    result = extract_isolated(data, mime_type, MAX_PAGES, MAX_CHARS, parallel=False)
+    if result.failure:
+        raise ExtractionFailed(result.failure)
+    return result.text
+
+
+def process_student(job, output_dir, start_date, formats=('json',)):
+    """Build and write one student's schedule; returns a small summary dict"""
+    started = time.perf_counter()
+    summary = {'row': job.get('row'), 'student_id': job['student_id'], 'ok': False, 'failures': []}
+    cache = get_shared_parse_cache()
+    before = cache.stats()
+    try:
+        catalog = get_default_catalog()
+        first_day = job['preferences'].get('start_date') or start_date
+        # Undated years resolve against the schedule's start, not the day the batch runs
+        reference_date = date.fromisoformat(str(first_day))
+        parsed = []
+        for path in job['files']:
+            mime_type = MIME_TYPES.get(os.path.splitext(path)[1].lower())
+            if mime_type is None:
+                summary['failures'].append(f'{os.path.basename(path)}: unsupported file type')
+                continue
+            try:
+                with open(path, 'rb') as handle:
+                    data = handle.read()
+                parsed.append(cache.get_or_parse(
+                    data,
+                    lambda: _extract(data, mime_type),
+                    lambda text: smart_parse_schedule(text, catalog=catalog, reference_date=reference_date),
+                    MAX_PAGES,
+                    MAX_CHARS,
+                    catalog.fingerprint if catalog else None,
+                    academic_year(reference_date)
+                ))
+            except Exception as e:
+                summary['failures'].append(f'{os.path.basename(path)}: {e}')
+        if job['files'] and not parsed:
+            raise ValueError('no syllabus could be read')
+        courses, deadlines = _merge(parsed)
+
+        preferences = dict(job['preferences'])
+        if job.get('busy_file'):
+            with open(job['busy_file'], 'rb') as handle:
+                preferences['busy_blocks'] = read_busy_blocks(handle.read(), job['busy_file'])
+        days = preferences.get('days', HORIZON_DAYS)
+        schedule = generate_instant_schedule(courses, deadlines, preferences, start_date=reference_date, days=days)
+
+        output = {
+            'student_id': job['student_id'],
+            'courses': courses,
+            'deadlines': deadlines,
+            'preferences': preferences,
+            'schedule': schedule,
+            'generated_date': str(first_day),
+            'failures': summary['failures'],
+        }
+        name = job.get('output_name') or _UNSAFE_NAME.sub('_', job['student_id']) or 'student'
+        user_data = dict(preferences, courses=courses, deadlines=deadlines)
+        if 'json' in formats:
+            with open(os.path.join(output_dir, f'{name}.json'), 'w') as handle:
+                json.dump(output, handle, indent=2)
+        if 'ics' in formats:
+            with open(os.path.join(output_dir, f'{name}.ics'), 'w') as handle:
+                handle.write(generate_ics_calendar(schedule, user_data))
+        if 'pdf' in formats:
+            with open(os.path.join(output_dir, f'{name}.pdf'), 'wb') as handle:
+                handle.write(generate_pdf_schedule(schedule, user_data, start_date=reference_date).getvalue())
+        if 'pdf_full' in formats:
+            with open(os.path.join(output_dir, f'{name}_full.pdf'), 'wb') as handle:
+                generate_full_schedule_pdf(schedule, user_data, handle)
+        summary.update({
+            'ok': True,
+            'output_name': name,
+            'courses': len(courses),
+            'deadlines': len(deadlines),
+            'days': len(schedule),
+            'activities': sum(len(activities) for activities in schedule.values()),
+        })
+    except Exception as e:
+        summary['error'] = str(e)
+    # The cache lives in the worker, so each student reports its own lookups for the parent to add up
+    after = cache.stats()
+    summary['cache_hits'] = after['hits'] - before['hits']
+    summary['cache_misses'] = after['misses'] - before['misses']
+    summary['elapsed'] = time.perf_counter() - started
+    return summary
+
+
+def run_batch(jobs, output_dir, workers=None, max_pending=None, start_date=None, progress=None,
+              formats=('json',)):
+    """Process jobs on a process pool and return the throughput summary
+
+    workers=0 runs everything in this process. progress(done, summary) is
+    called as each student finishes. Jobs carrying an 'error' (see
+    read_manifest) are recorded as failed without being run. Students lost
+    to a dead pool worker are resubmitted once on a fresh pool.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    start_date = (start_date or date.today()).isoformat()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    max_pending = max_pending or max(1, workers) * 4
+    results = []
+    # summary.json shares the output directory
+    used_names = {'summary', 'summary_full'}
+    started = time.perf_counter()
+
+    def finished(summary):
+        results.append(summary)
+        if progress:
+            progress(len(results), summary)
+
+    def runnable(jobs):
+        for job in jobs:
+            if 'error' in job:
+                finished(_failed(job, job['error']))
+            else:
+                yield dict(job, output_name=_output_name(job['student_id'], used_names))
+
+    if workers == 0:
+        for job in runnable(jobs):
+            finished(process_student(job, output_dir, start_date, formats))
+    else:
+        pending = {}
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+
+        def submit(job, attempt=0):
+            nonlocal pool
+            try:
+                future = pool.submit(process_student, job, output_dir, start_date, formats)
+            except BrokenProcessPool:
+                # A dead worker breaks the whole pool; the rest of the roster gets a fresh one
+                pool.shutdown(wait=False)
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=process_context())
+                future = pool.submit(process_student, job, output_dir, start_date, formats)
+            pending[future] = (job, attempt)
+
+        def collect(done):
+            for future in done:
+                job, attempt = pending.pop(future)
+                try:
+                    summary = future.result()
+                except BrokenProcessPool as e:
+                    # Every student in flight goes down with the worker that died (e.g. to the
+                    # OOM killer), so each gets one more try before it is recorded as failed
+                    if not attempt:
+                        submit(job, attempt + 1)
+                        continue
+                    summary = _failed(job, f'worker failed: {type(e).__name__}: {e}')
+                except Exception as e:
+                    summary = _failed(job, f'worker failed: {type(e).__name__}: {e}')
+                finished(summary)
+
+        try:
+            for job in runnable(jobs):
+                if len(pending) >= max_pending:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                submit(job)
+            while pending:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+        finally:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    succeeded = [result for result in results if result['ok']]
+    days = sum(result['days'] for result in succeeded)
+    latencies = sorted(result['elapsed'] for result in results)
+    cache_hits = sum(result.get('cache_hits', 0) for result in results)
+    cache_lookups = cache_hits + sum(result.get('cache_misses', 0) for result in results)
+    report = {
+        'students': len(results),
+        'succeeded': len(succeeded),
+        'failed': len(results) - len(succeeded),
+        'files_with_errors': sum(len(result['failures']) for result in results),
+        'workers': workers,
+        'elapsed_s': round(elapsed, 3),
+        'students_per_s': round(len(results) / elapsed, 2) if elapsed else None,
+        'days_per_s': round(days / elapsed, 1) if elapsed else None,
+        'p50_student_s': round(latencies[len(latencies) // 2], 4) if latencies else None,
+        'max_student_s': round(latencies[-1], 4) if latencies else None,
+        'parse_cache': {
+            'hits': cache_hits,
+            'misses': cache_lookups - cache_hits,
+            'hit_rate': round(cache_hits / cache_lookups, 3) if cache_lookups else 0.0,
+        },
+        'errors': sorted(({'row': result.get('row'), 'student_id': result['student_id'], 'error': result['error']}
+                          for result in results if 'error' in result),
+                         key=lambda error: (error['row'] is None, error['row'] or 0)),
+    }
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as handle:
+        json.dump(report, handle, indent=2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('manifest', help='CSV or JSON roster')
+    parser.add_argument('--output-dir', default='schedules')
+    parser.add_argument('--workers', type=int, default=None, help='process count (0 = run inline)')
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help='students submitted but not finished at once (default 4 x workers)')
+    parser.add_argument('--start-date', type=date.fromisoformat, default=None,
+                        help='first scheduled day, YYYY-MM-DD (default today)')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['json'],
+                        help='files written per student (default json)')
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    jobs = read_manifest(args.manifest)
+
+    def progress(done, summary):
+        if not args.quiet:
+            status = 'ok' if summary['ok'] else f"FAILED: {summary.get('error')}"
+            print(f"[{done}] {summary['student_id']} {status} ({summary['elapsed']:.2f}s)",
+                  file=sys.stderr, flush=True)
+
+    report = run_batch(jobs, args.output_dir, args.workers, args.max_pending, args.start_date, progress,
+                       args.formats)
+    print(json.dumps({key: value for key, value in report.items() if key != 'errors'}, indent=2))
+    if report['failed']:
+        print(f"{report['failed']} students failed; see {os.path.join(args.output_dir, 'summary.json')}",
+              file=sys.stderr)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""External busy blocks (classes, work shifts) the scheduler plans around
+
+A busy block is a dict with a title, start and end minute, and either a
+'date' (YYYY-MM-DD, one-off) or a 'weekday' (0 = Monday, repeats weekly).
+read_busy_blocks accepts CSV or JSON rows with 'title', 'start', 'end' and
+a 'day' column. 'day' holds a date or weekday names such as 'Mon/Wed/Fri'.
+Times may be '14:30', '2:30 PM' or minutes. Blocks are indexed by date and
+weekday once, so each day looks its own blocks up directly.
+"""
+import csv
+import io
+import json
+import re
+from collections import defaultdict
+from datetime import date as date_type
+
+from .timemodel import MINUTES_PER_DAY, parse_time_label
+
+_WEEKDAYS = {
+    'mon': 0, 'm': 0, 'tue': 1, 'tues': 1, 't': 1, 'wed': 2, 'w': 2, 'thu': 3, 'thur': 3, 'thurs': 3, 'r': 3,
+    'fri': 4, 'f': 4, 'sat': 5, 'sun': 6,
+}
+_CLOCK = re.compile(r'^\s*([01]?\d|2[0-4]):([0-5]\d)\s*$')
+_DAY_SPLIT = re.compile(r'[\s,/;&]+')
+
+
+def parse_clock(value):
+    """Minutes after midnight from '14:30', '2:30 PM' or an integer, or None"""
+    if isinstance(value, int):
+        return value
+    value = str(value or '').strip()
+    if value.isdigit():
+        return int(value)
+    match = _CLOCK.match(value)
+    if match:
+        return int(match.group(1)) * 60 + int(match.group(2))
+    return parse_time_label(value)
+
+
+def _weekdays(day):
+    days = []
+    for token in _DAY_SPLIT.split(day.strip().lower()):
+        weekday = _WEEKDAYS.get(token) if token else None
+        if weekday is None:
+            weekday = _WEEKDAYS.get(token[:3]) if len(token) > 3 else None
+        if weekday is None:
+            return []
+        days.append(weekday)
+    return days
+
+
+def normalize_busy_blocks(rows):
+    """Turn raw rows into busy block dicts, one per weekday; invalid rows are skipped"""
+    blocks = []
+    for row in rows:
+        start, end = parse_clock(row.get('start')), parse_clock(row.get('end'))
+        if start is None or end is None:
+            continue
+        if end <= start:
+            end = MINUTES_PER_DAY
+        block = {'title': str(row.get('title') or 'Busy').strip(), 'start': start, 'end': min(end, MINUTES_PER_DAY)}
+        day = str(row.get('day') or row.get('date') or '').strip()
+        try:
+            blocks.append(dict(block, date=date_type.fromisoformat(day).isoformat()))
+            continue
+        except ValueError:
+            pass
+        if 'weekday' in row and str(row['weekday']).isdigit():
+            blocks.append(dict(block, weekday=int(row['weekday']) % 7))
+            continue
+        blocks.extend(dict(block, weekday=weekday) for weekday in _weekdays(day))
+    return blocks
+
+
+def read_busy_blocks(data, filename):
+    """Read busy blocks from CSV or JSON file bytes"""
+    if filename.lower().endswith('.json'):
+        rows = json.loads(data.decode('utf-8'))
+    else:
+        rows = list(csv.DictReader(io.StringIO(data.decode('utf-8-sig'))))
+    return normalize_busy_blocks(rows)
+
+
+def index_busy_blocks(blocks):
+    """Group busy blocks into {'dates': {...}, 'weekdays': {...}} lookups"""
+    index = {'dates': defaultdict(list), 'weekdays': defaultdict(list)}
+    for block in blocks or ():
+        if block.get('date'):
+            index['dates'][block['date']].append(block)
+        elif block.get('weekday') is not None:
+            index['weekdays'][block['weekday']].append(block)
+    return index
+
+
+def busy_blocks_for(index, date, date_str):
+    """Busy blocks that apply to one date"""
+    return index['weekdays'].get(date.weekday(), []) + index['dates'].get(date_str, [])
@@ -0,0 +1,179 @@
+"""Content-addressed caches for syllabus extraction and parsing"""
+import copy
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Bump whenever extraction or parsing output changes so stale entries miss
+PARSER_VERSION = "5"
+
+
+def content_key(data, *parts):
+    """Build a cache key from the SHA-256 of the file bytes and the parser version"""
+    digest = hashlib.sha256(data).hexdigest()
+    return ":".join([digest, PARSER_VERSION] + [str(part) for part in parts])
+
+
+def estimate_size(value):
+    """Approximate the memory footprint of plain str/list/dict data in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key) + estimate_size(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by an approximate byte budget"""
+
+    def __init__(self, max_bytes, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self.ttl is not None and time.monotonic() - entry[2] > self.ttl:
+            self._discard(key)
+            return None
+        return entry
+
+    def _discard(self, key):
+        self.current_bytes -= self._entries.pop(key)[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = estimate_size(value)
+        # Entries larger than the whole budget would only evict everything else
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, size, time.monotonic())
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Return counters suitable for logging or a monitoring endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+class ParseCache(LRUCache):
+    """LRU cache of extracted text and (courses, deadlines) keyed by file content"""
+
+    def get_or_parse(self, data, extract, parse, *key_parts):
+        """Return parsed courses/deadlines, running extract and parse only on a miss
+
+        Extra key_parts (e.g. extraction budgets) are folded into both keys.
+        Nothing is stored when extract or parse raises, so extract should raise
+        rather than return placeholder text for a file it could not read.
+        """
+        parse_key = content_key(data, 'parse', *key_parts)
+        entry = self.get(parse_key)
+        if entry is None:
+            text_key = content_key(data, 'text', *key_parts)
+            text = self.get(text_key)
+            if text is None:
+                text = extract()
+                self.put(text_key, text)
+            entry = parse(text)
+            self.put(parse_key, entry)
+        # Callers own their copy so session edits never leak back into the cache
+        return copy.deepcopy(entry)
+
+
+class ExportCache(LRUCache):
+    """LRU cache of built exports (PDF bytes, ICS text, ...) keyed by content fingerprint"""
+
+    def get_or_build(self, key, build):
+        """Return the cached artifact for key, calling build() only on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value)
+        return value
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+_shared_export_cache = None
+
+
+def get_shared_parse_cache():
+    """Return the process-wide parse cache shared by every session
+
+    Size and lifetime come from STUDYFLOW_PARSE_CACHE_MB (default 64) and
+    STUDYFLOW_PARSE_CACHE_TTL in seconds (default 86400, 0 disables expiry).
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_mb = float(os.environ.get('STUDYFLOW_PARSE_CACHE_MB', '64'))
+            ttl = float(os.environ.get('STUDYFLOW_PARSE_CACHE_TTL', '86400'))
+            _shared_cache = ParseCache(max_bytes=int(max_mb * 1024 * 1024), ttl=ttl or None)
+        return _shared_cache
+
+
+def get_shared_export_cache():
+    """Return the process-wide export cache
+
+    Exports are keyed by content, so sessions with identical schedules share
+    entries. Size and lifetime come from STUDYFLOW_EXPORT_CACHE_MB (default
+    32) and STUDYFLOW_EXPORT_CACHE_TTL in seconds (default 3600).
+    """
+    global _shared_export_cache
+    with _shared_cache_lock:
+        if _shared_export_cache is None:
+            max_mb = float(os.environ.get('STUDYFLOW_EXPORT_CACHE_MB', '32'))
+            ttl = float(os.environ.get('STUDYFLOW_EXPORT_CACHE_TTL', '3600'))
+            _shared_export_cache = ExportCache(max_bytes=int(max_mb * 1024 * 1024), ttl=ttl or None)
+        return _shared_export_cache
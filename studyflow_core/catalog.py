@@ -0,0 +1,163 @@
+"""Course catalog index for recognizing real course codes in syllabus text
+
+An institution's catalog (CSV or JSON of code, title and optional credits
+and difficulty) is compiled into a hash index keyed by the normalized code
+('BIO 1205', 'bio-1205' and 'BIO1205' all become 'BIO1205'). Every code ends
+in a number, so recognition reuses the course scanner's approach: walk the
+text once for digit runs and look up the letters just before each run, which
+finds every catalog code in a single pass without the junk the general regex
+lets through (room numbers, years, 'LOGY 1205').
+
+Building the index from a large catalog is cached on disk as a pickle keyed
+by the catalog file's SHA-256, so app start-up only pays for it once.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import pickle
+import re
+import threading
+
+# Bump when the pickled index layout changes
+INDEX_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'studyflow')
+
+_CODE = re.compile(r'^\s*([A-Za-z]{2,6})[\s-]*(\d{3,5})([A-Za-z]?)\s*$')
+_DIGIT_RUN = re.compile(r'\d{3,5}')
+
+
+def normalize_code(code):
+    """Return the canonical lookup key for a course code, or None if it isn't one"""
+    match = _CODE.match(code)
+    if not match:
+        return None
+    return ''.join(match.groups()).upper()
+
+
+def _read_entries(data, path):
+    """Yield catalog rows as dicts from CSV or JSON bytes"""
+    if path.lower().endswith('.json'):
+        rows = json.loads(data.decode('utf-8'))
+        if isinstance(rows, dict):
+            rows = [dict(row, code=code) if isinstance(row, dict) else {'code': code, 'title': row}
+                    for code, row in rows.items()]
+        return rows
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8-sig'))))
+
+
+def _as_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class CourseCatalog:
+    """Prebuilt index of catalog course codes"""
+
+    def __init__(self, entries):
+        self.index = {}
+        self.max_prefix = 0
+        for row in entries:
+            raw_code = str(row.get('code', '')).strip()
+            key = normalize_code(raw_code)
+            if key is None or key in self.index:
+                continue
+            self.index[key] = {
+                'code': raw_code,
+                'name': str(row.get('title') or row.get('name') or '').strip(),
+                'credits': _as_int(row.get('credits')),
+                'difficulty': _as_int(row.get('difficulty')),
+            }
+            self.max_prefix = max(self.max_prefix, len(_CODE.match(raw_code).group(1)))
+        self.fingerprint = hashlib.sha256(
+            json.dumps(sorted(self.index), separators=(',', ':')).encode('utf-8')
+        ).hexdigest()[:16]
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def load(cls, path, cache_dir=DEFAULT_CACHE_DIR):
+        """Load a CSV/JSON catalog, reusing a cached index when the file is unchanged"""
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        digest = hashlib.sha256(data).hexdigest()
+        cache_path = None
+        if cache_dir:
+            cache_path = os.path.join(cache_dir, f'catalog-{digest[:24]}-v{INDEX_VERSION}.pickle')
+            try:
+                with open(cache_path, 'rb') as handle:
+                    return pickle.load(handle)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass
+
+        catalog = cls(_read_entries(data, path))
+        if cache_path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                temp_path = f'{cache_path}.{os.getpid()}.tmp'
+                with open(temp_path, 'wb') as handle:
+                    pickle.dump(catalog, handle, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temp_path, cache_path)
+            except OSError:
+                pass
+        return catalog
+
+    def find(self, text):
+        """Return catalog entries mentioned in text, first occurrence order, deduplicated"""
+        found = []
+        seen = set()
+        for digits in _DIGIT_RUN.finditer(text):
+            start, end = digits.span()
+            if (start > 0 and text[start - 1].isdecimal()) or (end < len(text) and text[end].isdecimal()):
+                continue
+            # Walk back over one separator run, then the department letters
+            letters_end = start
+            while letters_end > 0 and letters_end > start - 3 and text[letters_end - 1] in ' -\t':
+                letters_end -= 1
+            letters_start = letters_end
+            while (letters_start > 0 and letters_end - letters_start < self.max_prefix
+                   and text[letters_start - 1].isascii() and text[letters_start - 1].isalpha()):
+                letters_start -= 1
+            if letters_start == letters_end:
+                continue
+            if letters_start > 0 and text[letters_start - 1].isalnum():
+                continue
+
+            prefix = text[letters_start:letters_end].upper() + digits.group()
+            candidates = [prefix]
+            if end < len(text) and text[end].isascii() and text[end].isalpha():
+                if end + 1 == len(text) or not text[end + 1].isalnum():
+                    candidates.insert(0, prefix + text[end].upper())
+                else:
+                    continue
+            for key in candidates:
+                entry = self.index.get(key)
+                if entry is not None:
+                    if key not in seen:
+                        seen.add(key)
+                        found.append(entry)
+                    break
+        return found
+
+
+_default_catalog = None
+_default_catalog_loaded = False
+_default_catalog_lock = threading.Lock()
+
+
+def get_default_catalog():
+    """Return the catalog named by STUDYFLOW_CATALOG, or None when unset"""
+    global _default_catalog, _default_catalog_loaded
+    with _default_catalog_lock:
+        if not _default_catalog_loaded:
+            path = os.environ.get('STUDYFLOW_CATALOG')
+            if path:
+                cache_dir = os.environ.get('STUDYFLOW_CACHE_DIR', DEFAULT_CACHE_DIR)
+                _default_catalog = CourseCatalog.load(path, cache_dir)
+            _default_catalog_loaded = True
+        return _default_catalog
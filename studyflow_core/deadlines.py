@@ -0,0 +1,257 @@
+"""Deadline extraction from syllabus text
+
+Every date expression this module understands (9/13, 9/13/24, Sept 13,
+September 13th, 2024-09-13, optionally led by a weekday) and every term
+header such as 'Fall 2024' contains a run of digits. The text is walked once
+looking for digit runs, and each run is checked against the few anchored
+patterns its neighbouring characters allow, the same trick the course
+scanner uses. Each line holding a date is classified by the assignment
+keywords on it, so the cost stays linear in the document length. Years
+missing from a date are inferred from the term, or from the academic year
+around the reference date when the syllabus never names its term. Only that
+academic year affects the result, so callers that cache parses fold
+academic_year(reference_date) into the key.
+
+A numeric date must start a word and may not run into a '%' or a further
+'/n', and a date whose explicit year lies more than MAX_YEAR_DISTANCE years
+from the term (or academic) year is dropped, so grading weights such as
+'10/20/30' are not read as 2030-10-20.
+"""
+import re
+from datetime import date
+
+from .determinism import content_id
+
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+_MONTH_NAMES = {
+    'jan', 'january', 'feb', 'february', 'mar', 'march', 'apr', 'april', 'may', 'jun', 'june',
+    'jul', 'july', 'aug', 'august', 'sep', 'sept', 'september', 'oct', 'october',
+    'nov', 'november', 'dec', 'december',
+}
+_SEASONS = {'fall', 'spring', 'summer', 'winter'}
+
+_NUMBER = re.compile(r'\d+')
+_NUMERIC_DATE = re.compile(r'(1[0-2]|0?[1-9])/(3[01]|[12]\d|0?[1-9])(?:/(\d{4}|\d{2}))?(?![\d/%])')
+_ISO_DATE = re.compile(r'(20\d{2})-(\d{1,2})-(\d{1,2})\b')
+_NAMED_DATE = re.compile(
+    r'([a-z]+)\.?[ \t]+(3[01]|[12]\d|0?[1-9])(?:st|nd|rd|th)?\b(?:,?[ \t]+(20\d{2})\b)?',
+    re.IGNORECASE
+)
+_TERM = re.compile(r'([a-z]+)\s+(20\d{2})\b', re.IGNORECASE)
+_WEEKDAY_BEFORE = re.compile(
+    r'\b(?:Mon|Tues?|Wed(?:nes)?|Thu(?:rs)?|Fri|Sat(?:ur)?|Sun)(?:day)?\.?,?[ \t]+$',
+    re.IGNORECASE
+)
+
+# Longest word that can lead a named date or term ('september')
+_MAX_WORD = 9
+
+# Earlier entries win when a line mentions several keywords
+DEADLINE_KEYWORDS = [
+    ('practical', 'practical', 'high'),
+    ('practice', 'assignment', 'medium'),
+    ('exam|midterm|final|test', 'exam', 'high'),
+    ('quiz', 'quiz', 'medium'),
+    ('project|paper|essay|presentation', 'project', 'medium'),
+    ('assignment|homework|hw|lab|report|due|learnsmart|online', 'assignment', 'medium'),
+]
+
+_KEYWORD_RANKS = {
+    word: rank for rank, (words, _, _) in enumerate(DEADLINE_KEYWORDS) for word in words.split('|')
+}
+_KEYWORD_PATTERN = re.compile(
+    r'\b(' + '|'.join(sorted(_KEYWORD_RANKS, key=len, reverse=True)) + r')s?\b',
+    re.IGNORECASE
+)
+_TITLE_TRIM = ' \t-–—:|,;.*•'
+_WHITESPACE = re.compile(r'\s+')
+
+MAX_TITLE_LENGTH = 100
+# Explicit years further than this from the term or academic year are not deadlines
+MAX_YEAR_DISTANCE = 2
+
+
+def _classify(line):
+    """Return (type, priority) for the strongest keyword on a line, or None"""
+    ranks = [_KEYWORD_RANKS[word.lower()] for word in _KEYWORD_PATTERN.findall(line)]
+    if not ranks:
+        return None
+    return DEADLINE_KEYWORDS[min(ranks)][1:]
+
+
+def academic_year(reference_date):
+    """Calendar year in which the academic year containing reference_date began (July-June)"""
+    return reference_date.year if reference_date.month >= 7 else reference_date.year - 1
+
+
+def _infer_year(month, season, term_year, fall_year):
+    if season:
+        if season == 'fall':
+            return term_year if month >= 7 else term_year + 1
+        if season in ('spring', 'winter'):
+            return term_year if month <= 7 else term_year - 1
+        return term_year
+    # No term named: assume the academic year around the reference date
+    return fall_year if month >= 7 else fall_year + 1
+
+
+def _title_for(line, spans, line_start, fallback):
+    pieces = []
+    cursor = line_start
+    for start, end in spans:
+        pieces.append(line[cursor - line_start:start - line_start])
+        cursor = end
+    pieces.append(line[cursor - line_start:])
+    title = _WHITESPACE.sub(' ', ' '.join(piece.strip(_TITLE_TRIM) for piece in pieces)).strip(_TITLE_TRIM)
+    return title[:MAX_TITLE_LENGTH] if title else fallback
+
+
+def _course_for(line, course_codes, default):
+    compact = line.upper().replace(' ', '').replace('-', '')
+    for code in course_codes:
+        if code.replace(' ', '').replace('-', '') in compact:
+            return code
+    return default
+
+
+def _word_before(text, position):
+    """Return (start, lowercased word) for the word ending just before position"""
+    end = position
+    while end > 0 and text[end - 1] in ' \t\n\r':
+        end -= 1
+    if end > 0 and text[end - 1] == '.':
+        end -= 1
+    start = end
+    while start > 0 and end - start <= _MAX_WORD and text[start - 1].isascii() and text[start - 1].isalpha():
+        start -= 1
+    # A longer run, or one glued to a digit/underscore, is not a standalone word
+    if start == end or end - start > _MAX_WORD or (start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_')):
+        return start, None
+    return start, text[start:end].lower()
+
+
+def iter_dates(text):
+    """Yield (kind, span, parts) for dates and term headers in document order
+
+    kind is 'term' with parts (season, year) or 'date' with parts
+    (year or None, month, day).
+    """
+    consumed = 0
+    for number in _NUMBER.finditer(text):
+        start, end = number.span()
+        if start < consumed:
+            continue
+        before = text[start - 1] if start > 0 else ''
+        after = text[end] if end < len(text) else ''
+
+        if after == '-' and end - start == 4 and not (before.isalnum() or before == '_'):
+            match = _ISO_DATE.match(text, start)
+            if match:
+                consumed = match.end()
+                yield 'date', match.span(), (int(match.group(1)), int(match.group(2)), int(match.group(3)))
+                continue
+        if after == '/' and not (before.isalnum() or before in ('/', '_')):
+            match = _NUMERIC_DATE.match(text, start)
+            if match:
+                year = match.group(3)
+                if year:
+                    year = int(year) + (2000 if len(year) == 2 else 0)
+                consumed = match.end()
+                yield 'date', match.span(), (year, int(match.group(1)), int(match.group(2)))
+                continue
+
+        word_start, word = _word_before(text, start)
+        if word in _MONTH_NAMES and word_start >= consumed:
+            match = _NAMED_DATE.match(text, word_start)
+            if match:
+                year = match.group(3)
+                consumed = match.end()
+                yield 'date', match.span(), (int(year) if year else None, _MONTHS[word[:3]], int(match.group(2)))
+                continue
+        if word in _SEASONS and end - start == 4 and word_start >= consumed:
+            match = _TERM.match(text, word_start)
+            if match:
+                consumed = match.end()
+                yield 'term', match.span(), (word, int(match.group(2)))
+
+
+def extract_deadlines(text, courses, reference_date=None):
+    """Find dated assignments, exams and practicals in syllabus text
+
+    Returns deadline dicts shaped like the rest of the app expects:
+    id, title, date (YYYY-MM-DD), type, course and priority. IDs are derived
+    from the deadline content, so the same syllabus and academic year of
+    reference_date (default today) always yield the same deadlines and IDs.
+    """
+    fall_year = academic_year(reference_date or date.today())
+    course_codes = [course['code'] for course in courses]
+    default_course = course_codes[0] if course_codes else 'N/A'
+
+    season = term_year = None
+    # Raw hits are resolved after the walk so a term named late still applies
+    hits = []
+    line_start = line_end = -1
+    line = line_kind = None
+    line_hits = []
+
+    def flush():
+        if line_kind and line_hits:
+            spans = [span for span, _ in line_hits]
+            title = _title_for(line, spans, line_start, line_kind[0].title())
+            course = _course_for(line, course_codes, default_course)
+            for _, parts in line_hits:
+                hits.append((parts, title, course, line_kind))
+
+    for kind, (start, end), parts in iter_dates(text):
+        if kind == 'term':
+            if season is None:
+                season, term_year = parts
+            continue
+
+        if start > line_end:
+            flush()
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', end)
+            if line_end == -1:
+                line_end = len(text)
+            line = text[line_start:line_end]
+            line_kind = _classify(line)
+            line_hits = []
+        if not line_kind:
+            continue
+
+        # Fold a leading weekday ('Thursday, Sept 5') into the date span
+        weekday = _WEEKDAY_BEFORE.search(text, max(line_start, start - 12), start)
+        if weekday:
+            start = weekday.start()
+        line_hits.append(((start, end), parts))
+    flush()
+
+    deadlines = []
+    seen = set()
+    anchor_year = term_year if season else fall_year
+    for (year, month, day), title, course, (kind, priority) in hits:
+        if year is None:
+            year = _infer_year(month, season, term_year, fall_year)
+        elif abs(year - anchor_year) > MAX_YEAR_DISTANCE:
+            continue
+        try:
+            formatted_date = date(year, month, day).isoformat()
+        except ValueError:
+            continue
+        # The same exam title can be due for two courses on one day
+        if (course, formatted_date, title) in seen:
+            continue
+        seen.add((course, formatted_date, title))
+        deadlines.append({
+            'id': content_id(course, formatted_date, title),
+            'title': title,
+            'date': formatted_date,
+            'type': kind,
+            'course': course,
+            'priority': priority
+        })
+    return deadlines
@@ -0,0 +1,28 @@
+"""Seeds and IDs derived from content so identical inputs give identical output"""
+import hashlib
+import json
+import random
+import uuid
+
+# Fixed namespace so content IDs stay stable across processes and releases
+STUDYFLOW_NAMESPACE = uuid.UUID('6f1c2a4e-5b7d-4e8a-9c3f-2d1b0a9e8f7c')
+
+
+def _canonical(parts):
+    return json.dumps(parts, sort_keys=True, default=str, separators=(',', ':'))
+
+
+def derive_seed(*parts):
+    """Return a 64-bit integer seed from any JSON-serializable parts"""
+    digest = hashlib.sha256(_canonical(parts).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def seeded_random(*parts):
+    """Return a random.Random whose sequence depends only on parts"""
+    return random.Random(derive_seed(*parts))
+
+
+def content_id(*parts):
+    """Return a UUID string derived from content instead of uuid4()"""
+    return str(uuid.uuid5(STUDYFLOW_NAMESPACE, _canonical(parts)))
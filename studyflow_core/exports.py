@@ -0,0 +1,456 @@
+"""PDF, ICS and email exports of a generated schedule
+
+Nothing here touches Streamlit, so exports can be built by the app, the
+batch runner, benchmarks or a worker process alike.
+
+cached_export() memoizes each artifact under a fingerprint of the schedule,
+the user data, the export options and today's date (the PDF and email show
+it), so reruns that change none of those reuse the bytes already built.
+"""
+import json
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .cache import get_shared_export_cache
+from .determinism import content_id, derive_seed
+from .pdf_canvas import generate_full_schedule_pdf
+from .schema import Schedule, UserData
+from .timemodel import activity_start
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles():
+    """Paragraph and table styles for the PDF, built once per process and shared by every document"""
+    styles = getSampleStyleSheet()
+    grid = ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e0e6ff'))
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#6c5ce7')
+        ),
+        'subtitle': ParagraphStyle(
+            'CustomSubtitle',
+            parent=styles['Normal'],
+            fontSize=14,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#a29bfe')
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            textColor=colors.HexColor('#6c5ce7')
+        ),
+        'day_heading': ParagraphStyle(
+            'DayHeading',
+            parent=styles['Heading3'],
+            fontSize=14,
+            spaceAfter=6,
+            textColor=colors.HexColor('#6c5ce7')
+        ),
+        'footer': ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor('#666666')
+        ),
+        'summary_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9ff')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            grid
+        ]),
+        'course_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#6c5ce7')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9ff')),
+            grid
+        ]),
+        'deadline_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fd79a8')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff8f8')),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#ffe0e0'))
+        ]),
+        'day_table': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f8f9ff')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#333333')),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            grid
+        ]),
+    }
+
+
+def generate_pdf_schedule(schedule_data: Schedule, user_data: UserData,
+                          start_date: Optional[date] = None) -> BytesIO:
+    """Generate a beautiful PDF schedule; the week shown starts at start_date (default today)"""
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18, invariant=True)
+    
+    styles = _pdf_styles()
+    
+    # Build the story
+    story = []
+    
+    # Title
+    story.append(Paragraph("⚡ StudyFlow Schedule", styles['title']))
+    story.append(Paragraph("Your Personalized Study Schedule", styles['subtitle']))
+    story.append(Spacer(1, 12))
+    
+    # Summary section
+    courses = user_data.get('courses', [])
+    deadlines = user_data.get('deadlines', [])
+    
+    summary_data = [
+        ['📚 Total Courses', str(len(courses))],
+        ['⚠️ Upcoming Deadlines', str(len(deadlines))],
+        ['⏰ Daily Study Sessions', '3-4 sessions'],
+        ['🎯 Focus Time', f"{user_data.get('attention_span', 25)} minutes"],
+        ['📅 Schedule Type', user_data.get('schedule_type', 'Balanced')],
+        ['🗓️ Generated On', datetime.now().strftime('%B %d, %Y')]
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(styles['summary_table'])
+    
+    story.append(summary_table)
+    story.append(Spacer(1, 20))
+    
+    # Courses section
+    if courses:
+        story.append(Paragraph("📚 Your Courses", styles['heading']))
+        course_data = [['Course Code', 'Course Name', 'Difficulty', 'Credits']]
+        for course in courses:
+            difficulty_stars = '⭐' * course.get('difficulty', 3)
+            course_data.append([
+                course['code'],
+                course['name'][:40] + '...' if len(course['name']) > 40 else course['name'],
+                difficulty_stars,
+                str(course.get('credits', 3))
+            ])
+        
+        course_table = Table(course_data, colWidths=[1.5*inch, 2.5*inch, 1*inch, 0.8*inch])
+        course_table.setStyle(styles['course_table'])
+        
+        story.append(course_table)
+        story.append(Spacer(1, 20))
+    
+    # Deadlines section
+    if deadlines:
+        story.append(Paragraph("⚠️ Upcoming Deadlines", styles['heading']))
+        deadline_data = [['Date', 'Assignment', 'Course', 'Type', 'Priority']]
+        sorted_deadlines = sorted(deadlines, key=lambda x: x['date'])
+        
+        for deadline in sorted_deadlines:
+            priority_symbol = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}.get(deadline.get('priority', 'medium'), '🟡')
+            deadline_data.append([
+                deadline['date'],
+                deadline['title'][:30] + '...' if len(deadline['title']) > 30 else deadline['title'],
+                deadline.get('course', 'N/A'),
+                deadline.get('type', 'assignment').title(),
+                priority_symbol
+            ])
+        
+        deadline_table = Table(deadline_data, colWidths=[1*inch, 2*inch, 1*inch, 1*inch, 0.8*inch])
+        deadline_table.setStyle(styles['deadline_table'])
+        
+        story.append(deadline_table)
+        story.append(Spacer(1, 20))
+    
+    # Weekly schedule
+    story.append(Paragraph("📅 This Week's Schedule", styles['heading']))
+    
+    # Show 7 days starting from start_date
+    today = start_date or datetime.now()
+    for i in range(7):
+        date = today + timedelta(days=i)
+        date_str = date.strftime('%Y-%m-%d')
+        day_name = date.strftime('%A, %B %d')
+        
+        if date_str in schedule_data:
+            story.append(Paragraph(f"📅 {day_name}", styles['day_heading']))
+            
+            daily_schedule = schedule_data[date_str]
+            schedule_items = []
+            
+            for activity in daily_schedule:
+                activity_text = f"{activity['time']} - {activity['activity']}"
+                if activity.get('duration'):
+                    activity_text += f" ({activity['duration']} min)"
+                schedule_items.append(activity_text)
+            
+            # Create schedule table for the day
+            day_data = [[item] for item in schedule_items]
+            if day_data:
+                day_table = Table(day_data, colWidths=[5.5*inch])
+                day_table.setStyle(styles['day_table'])
+                
+                story.append(day_table)
+                story.append(Spacer(1, 12))
+        
+        # Add page break after 4 days
+        if i == 3:
+            story.append(PageBreak())
+    
+    # Footer
+    story.append(Spacer(1, 30))
+    story.append(Paragraph(
+        "Generated by StudyFlow - Your AI-Powered Study Scheduler",
+        styles['footer']
+    ))
+    
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
+
+
+def generate_ics_calendar(schedule_data: Schedule, user_data: UserData) -> str:
+    """Generate ICS calendar file"""
+    ics_content = f"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//StudyFlow//StudyFlow 2025//EN
+CALSCALE:GREGORIAN
+METHOD:PUBLISH
+X-WR-CALNAME:StudyFlow Schedule
+X-WR-TIMEZONE:America/New_York
+BEGIN:VTIMEZONE
+TZID:America/New_York
+X-LIC-LOCATION:America/New_York
+BEGIN:DAYLIGHT
+TZOFFSETFROM:-0500
+TZOFFSETTO:-0400
+TZNAME:EDT
+DTSTART:20240310T020000
+RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU
+END:DAYLIGHT
+BEGIN:STANDARD
+TZOFFSETFROM:-0400
+TZOFFSETTO:-0500
+TZNAME:EST
+DTSTART:20241103T020000
+RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU
+END:STANDARD
+END:VTIMEZONE
+"""
+    
+    for date_str, activities in schedule_data.items():
+        event_date = datetime.strptime(date_str, '%Y-%m-%d')
+        # Same-titled events on one day (e.g. two courses' deadlines) still need distinct UIDs
+        occurrences = Counter()
+        for activity in activities:
+            if activity['type'] in ['study', 'deadline', 'meal']:
+                event_key = (activity['time'], activity['activity'], activity.get('course'))
+                occurrences[event_key] += 1
+                event_id = content_id(date_str, *event_key, occurrences[event_key])
+                
+                try:
+                    # Start minute is stored on the activity; 9:00 AM if unknown
+                    start_datetime = event_date + timedelta(minutes=activity_start(activity, 9 * 60))
+                    
+                    # Duration
+                    duration_minutes = activity.get('duration', 30)
+                    if duration_minutes == 0:  # Deadlines
+                        duration_minutes = 15
+                    
+                    end_datetime = start_datetime + timedelta(minutes=duration_minutes)
+                    
+                    # Format for ICS
+                    start_str = start_datetime.strftime('%Y%m%dT%H%M%S')
+                    end_str = end_datetime.strftime('%Y%m%dT%H%M%S')
+                    
+                    # Clean activity name for ICS
+                    activity_name = activity['activity'].replace('\n', ' ').replace('\r', ' ')
+                    
+                    # Set category and description
+                    category = activity['type'].upper()
+                    description = f"StudyFlow Event\\nType: {activity['type']}\\nDuration: {duration_minutes} minutes"
+                    
+                    if activity.get('course'):
+                        description += f"\\nCourse: {activity['course']}"
+                    
+                    ics_content += f"""BEGIN:VEVENT
+UID:{event_id}@studyflow.app
+DTSTART;TZID=America/New_York:{start_str}
+DTEND;TZID=America/New_York:{end_str}
+SUMMARY:{activity_name}
+DESCRIPTION:{description}
+CATEGORIES:{category}
+STATUS:CONFIRMED
+TRANSP:OPAQUE
+END:VEVENT
+"""
+                except Exception as e:
+                    continue
+    
+    ics_content += "END:VCALENDAR"
+    return ics_content
+
+
+def create_email_content_with_attachment_instructions(schedule_data: Schedule, user_data: UserData,
+                                                      start_date: Optional[date] = None) -> Tuple[str, str]:
+    """Create email content with PDF attachment instructions; the preview starts at start_date (default today)"""
+    courses = user_data.get('courses', [])
+    deadlines = user_data.get('deadlines', [])
+    
+    subject = "Your StudyFlow Schedule is Ready! ⚡ (PDF Attached)"
+    
+    body = f"""Hey there! 👋
+
+Your personalized StudyFlow schedule is ready! I've attached the PDF for easy reference.
+
+📊 YOUR SCHEDULE STATS:
+• {len(courses)} courses tracked
+• {len(deadlines)} deadlines managed
+• {user_data.get('attention_span', 25)}-minute focus blocks (perfect for your attention span!)
+• {user_data.get('schedule_type', 'Balanced')} intensity level
+
+📚 YOUR COURSES:
+"""
+    
+    for course in courses:
+        body += f"• {course['code']} - {course['name']} (Difficulty: {course.get('difficulty', 3)}/5)\n"
+    
+    if deadlines:
+        body += f"""
+⚠️ UPCOMING DEADLINES:
+"""
+        sorted_deadlines = sorted(deadlines, key=lambda x: x['date'])
+        for deadline in sorted_deadlines:
+            priority_emoji = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}.get(deadline.get('priority', 'medium'), '🟡')
+            body += f"• {deadline['date']}: {deadline['title']} ({deadline.get('course', 'N/A')}) {priority_emoji}\n"
+    
+    body += f"""
+📅 THIS WEEK'S PREVIEW:
+"""
+    
+    # Add preview of the first 3 days from start_date
+    today = start_date or datetime.now()
+    for i in range(3):
+        date = today + timedelta(days=i)
+        date_str = date.strftime('%Y-%m-%d')
+        day_name = date.strftime('%A, %B %d')
+        
+        if date_str in schedule_data:
+            body += f"\n{day_name}:\n"
+            daily_schedule = schedule_data[date_str]
+            
+            for activity in daily_schedule[:6]:  # Show first 6 activities
+                body += f"  {activity['time']} - {activity['activity']}\n"
+            
+            if len(daily_schedule) > 6:
+                body += f"  ... and {len(daily_schedule) - 6} more activities\n"
+    
+    body += f"""
+
+📎 ATTACHED FILES:
+• StudyFlow_Schedule.pdf - Your complete schedule for printing and reference
+• StudyFlow_Calendar.ics - Import this into your phone's calendar app
+
+🎯 WHY THIS SCHEDULE WORKS:
+✅ Realistic {user_data.get('attention_span', 25)}-minute study blocks
+✅ Built-in social media breaks (because we're human!)
+✅ Flexible enough for your actual college life
+✅ AI-powered optimization based on your courses
+✅ Accounts for procrastination (we get it!)
+
+💡 PRO TIPS:
+• Print the PDF and put it on your dorm wall
+• Import the calendar file to your phone for notifications
+• Use your phone breaks wisely - set timers!
+• Study groups are great for accountability
+• Your evening social time is protected - balance is key!
+
+📱 NEXT STEPS:
+1. Print the attached PDF for offline reference
+2. Import the calendar file to your phone
+3. Start with just ONE study block today
+4. Adjust as needed - this is YOUR schedule!
+
+🔥 You've got this! Your future self will thank you for taking control of your schedule.
+
+Generated by StudyFlow - Built for Real College Students
+StudyFlow.app
+
+P.S. Share this with your friends - they need better schedules too! 📤
+
+---
+REMINDER: Don't forget to manually attach the PDF file before sending!
+"""
+    
+    return subject, body
+
+
+def generate_save_data(schedule_data: Schedule, user_data: UserData) -> str:
+    """JSON of the user's courses, deadlines, preferences and schedule for re-import"""
+    save_data = {
+        'courses': user_data.get('courses', []),
+        'deadlines': user_data.get('deadlines', []),
+        'preferences': user_data,
+        'schedule': {date_str: activities for date_str, activities in schedule_data.items()},
+        # Day resolution keeps the export byte-identical across reruns
+        'generated_date': datetime.now().date().isoformat()
+    }
+    return json.dumps(save_data, indent=2)
+
+
+def schedule_fingerprint(schedule):
+    """Content hash of a schedule; a LazySchedule hashes its inputs instead of its days"""
+    if hasattr(schedule, 'fingerprint'):
+        return schedule.fingerprint()
+    return derive_seed({date_str: list(activities) for date_str, activities in schedule.items()})
+
+
+def export_key(kind, schedule, user_data, **options):
+    """Cache key for one export of a schedule"""
+    return '%016x' % derive_seed(kind, schedule_fingerprint(schedule), user_data, options, date.today().isoformat())
+
+
+EXPORTERS = {
+    'pdf': lambda schedule, user_data, **options: generate_pdf_schedule(schedule, user_data, **options).getvalue(),
+    'pdf_full': lambda schedule, user_data: generate_full_schedule_pdf(schedule, user_data).getvalue(),
+    'ics': generate_ics_calendar,
+    'email': create_email_content_with_attachment_instructions,
+    'json': generate_save_data,
+}
+
+
+def cached_export(kind, schedule, user_data, cache=None, **options):
+    """Return the 'pdf' or 'pdf_full' bytes, 'ics' or 'json' text, or 'email' (subject, body), building only on a miss"""
+    cache = cache if cache is not None else get_shared_export_cache()
+    return cache.get_or_build(export_key(kind, schedule, user_data, **options),
+                              lambda: EXPORTERS[kind](schedule, user_data, **options))
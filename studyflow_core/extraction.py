@@ -0,0 +1,111 @@
+"""Streaming text extraction for uploaded syllabi"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import BinaryIO, Optional
+
+import PyPDF2
+import docx
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Budgets applied by the app; 0 disables a limit
+MAX_PAGES = int(os.environ.get('STUDYFLOW_MAX_PAGES', '200')) or None
+MAX_CHARS = int(os.environ.get('STUDYFLOW_MAX_CHARS', '2000000')) or None
+
+# Opt-in process-pool extraction for long PDFs; shorter files stay serial
+# because worker start-up costs more than PyPDF2 spends on a few pages
+PARALLEL_EXTRACTION = os.environ.get('STUDYFLOW_PARALLEL_EXTRACTION') == '1'
+PARALLEL_MIN_PAGES = int(os.environ.get('STUDYFLOW_PARALLEL_MIN_PAGES', '128'))
+
+
+def _iter_pdf_pages(data, max_pages):
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    page_count = len(reader.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    for index in range(page_count):
+        yield (reader.pages[index].extract_text() or "") + "\n"
+
+
+def _extract_page_range(data, start, stop):
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    return "".join((reader.pages[index].extract_text() or "") + "\n" for index in range(start, stop))
+
+
+def process_context():
+    """Multiprocessing context that is safe to use from a threaded server"""
+    # Forking a threaded Streamlit server can deadlock; forkserver/spawn start clean
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def pdf_page_count(data, max_pages=None):
+    """Number of pages extraction will read from a PDF under the page budget"""
+    page_count = len(PyPDF2.PdfReader(BytesIO(data)).pages)
+    return page_count if max_pages is None else min(page_count, max_pages)
+
+
+def extract_pdf_text_parallel(data, max_workers=None, max_pages=None, min_pages=PARALLEL_MIN_PAGES,
+                              mp_context=None):
+    """Extract PDF text by splitting page ranges across a process pool
+
+    Pages are merged back in document order. Files with fewer than min_pages
+    pages, or a single available worker, use the serial path. mp_context
+    defaults to process_context().
+    """
+    page_count = pdf_page_count(data, max_pages)
+    workers = min(max_workers or os.cpu_count() or 1, page_count)
+    if page_count < min_pages or workers <= 1:
+        return "".join(_iter_pdf_pages(data, max_pages))
+
+    step = -(-page_count // workers)
+    starts = list(range(0, page_count, step))
+    stops = [min(start + step, page_count) for start in starts]
+    with ProcessPoolExecutor(max_workers=len(starts), mp_context=mp_context or process_context()) as pool:
+        return "".join(pool.map(_extract_page_range, [data] * len(starts), starts, stops))
+
+
+def _iter_docx_paragraphs(data):
+    for paragraph in docx.Document(BytesIO(data)).paragraphs:
+        yield paragraph.text + "\n"
+
+
+def iter_text_chunks(data, mime_type, max_pages=None, max_chars=None):
+    """Yield page/paragraph text chunks until the page or character budget runs out"""
+    if mime_type == PDF_MIME:
+        chunks = _iter_pdf_pages(data, max_pages)
+    elif mime_type == DOCX_MIME:
+        chunks = _iter_docx_paragraphs(data)
+    else:
+        chunks = iter([str(data, "utf-8")])
+
+    remaining = max_chars
+    for chunk in chunks:
+        if remaining is not None:
+            if len(chunk) >= remaining:
+                yield chunk[:remaining]
+                return
+            remaining -= len(chunk)
+        yield chunk
+
+
+def extract_text(data, mime_type, max_pages=None, max_chars=None, parallel=False):
+    """Extract text from raw file bytes, assembling chunks in linear time"""
+    if parallel and mime_type == PDF_MIME:
+        text = extract_pdf_text_parallel(data, max_pages=max_pages)
+        return text if max_chars is None else text[:max_chars]
+    return "".join(iter_text_chunks(data, mime_type, max_pages, max_chars))
+
+
+def extract_text_from_file(file: BinaryIO, max_pages: Optional[int] = None, max_chars: Optional[int] = None,
+                           parallel: bool = False) -> str:
+    """Extract text from uploaded file"""
+    try:
+        data = file.getvalue() if hasattr(file, 'getvalue') else file.read()
+        return extract_text(data, file.type, max_pages, max_chars, parallel)
+    except Exception:
+        return ""
@@ -0,0 +1,148 @@
+"""Interval index and free-time placement for a day's activities
+
+Intervals are half-open [start, end) in minutes after midnight.
+IntervalIndex sorts them by start once and keeps a running maximum of the
+ends. That makes "does anything overlap [a, b)?" a bisection plus one
+lookup, and lets all overlapping pairs be found with a single sweep, so
+conflict detection is O(n log n) however many busy blocks a day holds.
+
+FreeTime holds the sorted gaps left between busy intervals inside the
+waking window. Each study block or movable activity goes into the first
+gap at or after its preferred start that can hold it, or the latest
+earlier one, and the gap is then split around it.
+"""
+from bisect import bisect_left, bisect_right
+
+
+def merge_intervals(intervals):
+    """Return the union of (start, end) intervals as sorted, disjoint intervals"""
+    merged = []
+    for start, end in sorted(interval for interval in intervals if interval[1] > interval[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+class IntervalIndex:
+    """Static index of (start, end, payload) intervals sorted by start"""
+
+    def __init__(self, intervals):
+        items = sorted((item for item in intervals if item[1] > item[0]), key=lambda item: (item[0], item[1]))
+        self.starts = [item[0] for item in items]
+        self.ends = [item[1] for item in items]
+        self.payloads = [item[2] if len(item) > 2 else None for item in items]
+        # max_end[i] is the largest end among the first i + 1 intervals
+        self.max_end = []
+        running = None
+        for end in self.ends:
+            running = end if running is None or end > running else running
+            self.max_end.append(running)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        """True if any indexed interval intersects [start, end)"""
+        candidates = bisect_left(self.starts, end)
+        return candidates > 0 and self.max_end[candidates - 1] > start
+
+    def overlapping(self, start, end):
+        """Payloads of the intervals intersecting [start, end), in start order"""
+        found = []
+        position = bisect_left(self.starts, end) - 1
+        while position >= 0 and self.max_end[position] > start:
+            if self.ends[position] > start:
+                found.append(self.payloads[position])
+            position -= 1
+        found.reverse()
+        return found
+
+    def conflicts(self):
+        """Every overlapping pair of payloads, found in one sweep over the starts"""
+        pairs = []
+        active = []
+        for position, start in enumerate(self.starts):
+            active = [other for other in active if self.ends[other] > start]
+            for other in active:
+                pairs.append((self.payloads[other], self.payloads[position]))
+            active.append(position)
+        return pairs
+
+
+def activity_interval(activity):
+    """(start, end) of an activity dict; zero-length for deadline reminders"""
+    start = activity['start']
+    return start, start + (activity.get('duration') or 0)
+
+
+def find_conflicts(activities):
+    """Overlapping pairs of activities in one day"""
+    return IntervalIndex(activity_interval(activity) + (activity,) for activity in activities).conflicts()
+
+
+class FreeTime:
+    """Free gaps inside a waking window, carved up as activities are placed"""
+
+    def __init__(self, window_start, window_end, busy=()):
+        self.gaps = []
+        cursor = window_start
+        for start, end in merge_intervals(busy):
+            if end <= cursor:
+                continue
+            if start >= window_end:
+                break
+            if start > cursor:
+                self.gaps.append((cursor, start))
+            cursor = max(cursor, end)
+        if cursor < window_end:
+            self.gaps.append((cursor, window_end))
+        self._starts = [gap[0] for gap in self.gaps]
+
+    def total(self):
+        return sum(end - start for start, end in self.gaps)
+
+    def _take(self, position, start, end):
+        gap_start, gap_end = self.gaps[position]
+        pieces = [(piece_start, piece_end) for piece_start, piece_end in ((gap_start, start), (end, gap_end))
+                  if piece_end > piece_start]
+        self.gaps[position:position + 1] = pieces
+        self._starts[position:position + 1] = [piece[0] for piece in pieces]
+
+    def place(self, preferred, duration, min_duration=None, max_shift=None):
+        """Reserve time for an activity and return (start, duration), or None
+
+        The activity starts at preferred when that time is free. Otherwise
+        it goes to the first later gap that fits it, then as late as
+        possible in the latest earlier gap that fits it. With min_duration
+        set, the activity may be shortened to fit a gap in either direction,
+        but never below min_duration. With max_shift set, it never starts
+        more than that many minutes away from preferred.
+        """
+        if duration <= 0:
+            return preferred, duration
+        first = max(0, bisect_right(self._starts, preferred) - 1)
+        for position in range(first, len(self.gaps)):
+            gap_start, gap_end = self.gaps[position]
+            start = max(gap_start, preferred)
+            if max_shift is not None and start - preferred > max_shift:
+                break
+            length = gap_end - start
+            if length >= duration or (min_duration is not None and length >= min_duration):
+                length = min(length, duration)
+                self._take(position, start, start + length)
+                return start, length
+        for position in range(min(first, len(self.gaps) - 1), -1, -1):
+            gap_start, gap_end = self.gaps[position]
+            length = gap_end - gap_start
+            if gap_start < preferred and (length >= duration or (min_duration is not None and length >= min_duration)):
+                length = min(length, duration)
+                # Nothing from preferred onwards fit, so ending at gap_end starts at or before preferred
+                start = gap_end - length
+                if max_shift is not None and preferred - start > max_shift:
+                    break
+                self._take(position, start, gap_end)
+                return start, length
+        return None
@@ -0,0 +1,153 @@
+"""Run extraction in a throwaway worker process with a timeout and memory cap"""
+import multiprocessing
+import os
+import signal
+import time
+from dataclasses import dataclass
+
+from .extraction import (PARALLEL_EXTRACTION, PDF_MIME, extract_pdf_text_parallel, iter_text_chunks,
+                         pdf_page_count, process_context)
+
+EXTRACTION_TIMEOUT = float(os.environ.get('STUDYFLOW_EXTRACTION_TIMEOUT', '20'))
+EXTRACTION_MAX_RSS_MB = float(os.environ.get('STUDYFLOW_EXTRACTION_MAX_RSS_MB', '512'))
+
+# How often the parent checks the worker's resident memory
+POLL_INTERVAL = 0.05
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of an isolated extraction
+
+    pages_processed counts PDF pages, docx paragraphs or 1 for plain text.
+    failure is None on success, otherwise 'timeout', 'memory' or an error string.
+    """
+    text: str
+    pages_processed: int
+    elapsed: float
+    failure: str = None
+
+    @property
+    def ok(self):
+        return self.failure is None
+
+
+class ExtractionFailed(Exception):
+    """Raised in place of a failed extraction's empty text so it is never cached"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def _page_context():
+    # The worker is single-threaded, so forking page workers is safe and keeps them in its process group
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+def _worker_main(conn, data, mime_type, max_pages, max_chars, parallel=False):
+    try:
+        if parallel:
+            if hasattr(os, 'setpgrp'):
+                os.setpgrp()
+            text = extract_pdf_text_parallel(data, max_pages=max_pages, mp_context=_page_context())
+            text = text if max_chars is None else text[:max_chars]
+            result = (None, text, pdf_page_count(data, max_pages))
+        else:
+            chunks = list(iter_text_chunks(data, mime_type, max_pages, max_chars))
+            result = (None, "".join(chunks), len(chunks))
+    except MemoryError:
+        result = ('memory', "", 0)
+    except Exception as e:
+        result = (f'{type(e).__name__}: {e}', "", 0)
+    try:
+        conn.send(result)
+    except OSError:
+        # The parent stopped waiting (timeout) or died; nobody is left to tell
+        pass
+    finally:
+        conn.close()
+
+
+def _rss_mb(pid):
+    """Resident set size of a process in MB, or 0 where /proc is unavailable"""
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0
+
+
+def _tree_rss_mb(pid):
+    """Resident memory of a process plus its direct children, where /proc lists them"""
+    total = _rss_mb(pid)
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as children:
+            total += sum(_rss_mb(child) for child in children.read().split())
+    except OSError:
+        pass
+    return total
+
+
+def _kill_group(pid):
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def extract_isolated(data, mime_type, max_pages=None, max_chars=None,
+                     timeout=EXTRACTION_TIMEOUT, max_rss_mb=EXTRACTION_MAX_RSS_MB, parallel=PARALLEL_EXTRACTION):
+    """Extract text in a separate process, killing it on timeout or excess memory
+
+    With parallel (STUDYFLOW_PARALLEL_EXTRACTION=1) the worker splits long
+    PDFs across its own page workers; the memory cap then covers them too,
+    and they are killed along with it.
+    """
+    parallel = parallel and mime_type == PDF_MIME
+    context = process_context()
+    receiver, sender = context.Pipe(duplex=False)
+    # Daemonic processes may not start children, so a parallel worker is not one
+    process = context.Process(
+        target=_worker_main,
+        args=(sender, data, mime_type, max_pages, max_chars, parallel),
+        daemon=not parallel
+    )
+    start = time.monotonic()
+    process.start()
+    sender.close()
+
+    failure, text, pages = 'timeout', "", 0
+    deadline = start + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if receiver.poll(min(POLL_INTERVAL, remaining)):
+                failure, text, pages = receiver.recv()
+                break
+            if not process.is_alive():
+                failure = f'worker exited with code {process.exitcode}'
+                break
+            rss_mb = _tree_rss_mb(process.pid) if parallel else _rss_mb(process.pid)
+            if max_rss_mb and rss_mb > max_rss_mb:
+                failure = 'memory'
+                break
+    except EOFError:
+        failure = 'worker exited without a result'
+    finally:
+        receiver.close()
+        if parallel and failure is not None:
+            _kill_group(process.pid)
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    return ExtractionResult(text, pages, time.monotonic() - start, failure)
@@ -0,0 +1,282 @@
+"""Full-horizon schedule PDF streamed page by page onto a fixed grid
+
+generate_pdf_schedule lays out a styled one-week summary with platypus
+tables, which measures every cell and keeps the whole story in memory
+until the document is built; ReportLab's canvas likewise holds every page
+until save. That gets slow and large for a semester of days. This renderer
+draws on a fixed grid instead, two columns of fixed-height rows per page
+with one heading row per day and one row per activity, so placing a row
+is only arithmetic. PDFStream writes each finished page (a compressed
+content stream and its page object) straight to the output, keeping just
+the byte offsets the cross-reference table needs, and days are pulled from
+the schedule one at a time (a LazySchedule builds them as they are
+reached). Memory therefore stays flat in the number of days.
+
+Only the standard Helvetica fonts are used, which cover Latin-1, so text
+is reduced to Latin-1 first: common typographic punctuation is mapped to
+ASCII and emoji are dropped (the activity type is shown by a colour swatch
+instead). Widths come from ReportLab's font metrics.
+"""
+import zlib
+from datetime import datetime
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from .schema import Schedule, UserData
+from .timemodel import activity_start, format_minutes
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+MARGIN = 36
+HEADER_HEIGHT = 40
+FOOTER_HEIGHT = 18
+COLUMNS = 2
+GUTTER = 18
+ROW_HEIGHT = 11
+FONT = 'Helvetica'
+BOLD_FONT = 'Helvetica-Bold'
+FONT_SIZE = 7.5
+TIME_WIDTH = 44
+SWATCH_WIDTH = 3
+DAY_GAP_ROWS = 1
+
+COLUMN_WIDTH = (PAGE_WIDTH - 2 * MARGIN - (COLUMNS - 1) * GUTTER) / COLUMNS
+GRID_TOP = PAGE_HEIGHT - MARGIN - HEADER_HEIGHT
+ROWS_PER_COLUMN = int((GRID_TOP - MARGIN - FOOTER_HEIGHT) // ROW_HEIGHT)
+
+
+def _rgb(hex_color):
+    value = int(hex_color.lstrip('#'), 16)
+    return tuple(round(channel / 255, 3) for channel in (value >> 16, (value >> 8) & 255, value & 255))
+
+
+ACCENT = _rgb('#6c5ce7')
+TEXT = _rgb('#333333')
+MUTED = _rgb('#666666')
+RULE = _rgb('#e0e6ff')
+WHITE = (1, 1, 1)
+TYPE_COLORS = {
+    'study': _rgb('#6c5ce7'),
+    'meal': _rgb('#fdcb6e'),
+    'break': _rgb('#fd79a8'),
+    'free': _rgb('#00b894'),
+    'deadline': _rgb('#e17055'),
+}
+OTHER_COLOR = _rgb('#a29bfe')
+
+_PUNCTUATION = str.maketrans({
+    '‘': "'", '’': "'", '“': '"', '”': '"', '–': '-', '—': '-',
+    '…': '...', '•': '*', '\u00a0': ' ',
+})
+# C1 control characters are Latin-1 but print as other glyphs under WinAnsiEncoding
+_CONTROL = dict.fromkeys(range(0x80, 0xa0))
+
+
+def latin1(text):
+    """Text the standard PDF fonts can draw: Latin-1 only, emoji dropped, spaces collapsed"""
+    text = str(text or '').translate(_PUNCTUATION)
+    text = text.encode('latin-1', 'ignore').decode('latin-1').translate(_CONTROL)
+    return ' '.join(text.split())
+
+
+def fit(text, width, font=FONT, size=FONT_SIZE):
+    """Truncate text with '...' so it fits within width points"""
+    if stringWidth(text, font, size) <= width:
+        return text
+    while text and stringWidth(text + '...', font, size) > width:
+        text = text[:-1]
+    return text.rstrip() + '...'
+
+
+def _number(value):
+    return ('%.2f' % value).rstrip('0').rstrip('.')
+
+
+def _color(rgb):
+    return ' '.join(_number(channel) for channel in rgb)
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class PDFStream:
+    """Minimal PDF writer that sends each page to the output as soon as it ends
+
+    Supports the few operations the grid needs: filled rectangles, lines
+    and single-line Helvetica text. Objects 1-4 are the catalog, page tree
+    and the two fonts; the catalog and page tree are written last, once the
+    pages are known.
+    """
+
+    FONTS = {FONT: 'F1', BOLD_FONT: 'F2'}
+
+    def __init__(self, output, title='StudyFlow Schedule'):
+        self.output = output
+        self.position = 0
+        self.offsets = {}
+        self.page_ids = []
+        self.next_id = 5
+        self.title = title
+        self._ops = None
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        for object_id, name in ((3, FONT), (4, BOLD_FONT)):
+            self._object(object_id, f'<< /Type /Font /Subtype /Type1 /BaseFont /{name} '
+                                    f'/Encoding /WinAnsiEncoding >>'.encode('latin-1'))
+
+    def _write(self, data):
+        self.output.write(data)
+        self.position += len(data)
+
+    def _object(self, object_id, body):
+        self.offsets[object_id] = self.position
+        self._write(b'%d 0 obj\n' % object_id + body + b'\nendobj\n')
+
+    def _allocate(self):
+        self.next_id += 1
+        return self.next_id - 1
+
+    def begin_page(self):
+        self._ops = []
+
+    def rect(self, x, y, width, height, rgb):
+        self._ops.append(f'{_color(rgb)} rg {_number(x)} {_number(y)} {_number(width)} {_number(height)} re f')
+
+    def line(self, x1, y1, x2, y2, rgb):
+        self._ops.append(f'{_color(rgb)} RG {_number(x1)} {_number(y1)} m {_number(x2)} {_number(y2)} l S')
+
+    def text(self, x, y, text, font=FONT, size=FONT_SIZE, rgb=TEXT, align='left'):
+        if align == 'right':
+            x -= stringWidth(text, font, size)
+        self._ops.append(f'BT {_color(rgb)} rg /{self.FONTS[font]} {_number(size)} Tf '
+                         f'{_number(x)} {_number(y)} Td ({_escape(text)}) Tj ET')
+
+    def end_page(self):
+        content = zlib.compress('\n'.join(self._ops).encode('latin-1'))
+        self._ops = None
+        content_id, page_id = self._allocate(), self._allocate()
+        self._object(content_id, b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(content) +
+                     content + b'\nendstream')
+        self._object(page_id, f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_number(PAGE_WIDTH)} '
+                              f'{_number(PAGE_HEIGHT)}] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> '
+                              f'/Contents {content_id} 0 R >>'.encode('latin-1'))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        if self._ops is not None:
+            self.end_page()
+        kids = ' '.join(f'{page_id} 0 R' for page_id in self.page_ids)
+        self._object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        self._object(2, f'<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>'.encode('latin-1'))
+        info_id = self._allocate()
+        self._object(info_id, f'<< /Title ({_escape(latin1(self.title))}) /Producer (StudyFlow) >>'.encode('latin-1'))
+        xref = self.position
+        lines = [b'xref\n0 %d\n' % self.next_id, b'0000000000 65535 f \n']
+        lines += [b'%010d 00000 n \n' % self.offsets[object_id] for object_id in range(1, self.next_id)]
+        self._write(b''.join(lines))
+        self._write(b'trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                    % (self.next_id, info_id, xref))
+
+
+class _Grid:
+    """Cursor over the fixed rows of the current page, starting new pages as they fill"""
+
+    def __init__(self, pdf, title, subtitle):
+        self.pdf = pdf
+        self.title = title
+        self.subtitle = subtitle
+        self.page = 0
+        self.column = COLUMNS
+        self.row = ROWS_PER_COLUMN
+
+    def _start_page(self):
+        if self.page:
+            self.pdf.end_page()
+        self.page += 1
+        pdf = self.pdf
+        pdf.begin_page()
+        pdf.text(MARGIN, PAGE_HEIGHT - MARGIN - 16, self.title, BOLD_FONT, 16, ACCENT)
+        pdf.text(MARGIN, PAGE_HEIGHT - MARGIN - 30, self.subtitle, FONT, 9, MUTED)
+        pdf.text(PAGE_WIDTH - MARGIN, MARGIN, f'Page {self.page}', FONT, 9, MUTED, align='right')
+        pdf.text(MARGIN, MARGIN, 'Generated by StudyFlow', FONT, 9, MUTED)
+        pdf.line(MARGIN, GRID_TOP + 4, PAGE_WIDTH - MARGIN, GRID_TOP + 4, RULE)
+
+    def remaining(self):
+        return ROWS_PER_COLUMN - self.row
+
+    def next_column(self):
+        self.column += 1
+        if self.column >= COLUMNS:
+            self._start_page()
+            self.column = 0
+        self.row = 0
+
+    def take(self):
+        """Reserve the next row and return its (x, baseline y)"""
+        if self.row >= ROWS_PER_COLUMN:
+            self.next_column()
+        x = MARGIN + self.column * (COLUMN_WIDTH + GUTTER)
+        y = GRID_TOP - (self.row + 1) * ROW_HEIGHT
+        self.row += 1
+        return x, y
+
+    def skip(self, rows):
+        self.row = min(self.row + rows, ROWS_PER_COLUMN)
+
+
+def _draw_day_heading(pdf, grid, heading):
+    x, y = grid.take()
+    pdf.rect(x, y - 2, COLUMN_WIDTH, ROW_HEIGHT, ACCENT)
+    pdf.text(x + 4, y + 1, heading, BOLD_FONT, FONT_SIZE + 0.5, WHITE)
+
+
+def _draw_activity(pdf, grid, activity):
+    x, y = grid.take()
+    pdf.rect(x, y - 1, SWATCH_WIDTH, ROW_HEIGHT - 2, TYPE_COLORS.get(activity.get('type'), OTHER_COLOR))
+    label = activity.get('time') or format_minutes(activity_start(activity, 0))
+    text = latin1(activity.get('activity'))
+    if activity.get('duration'):
+        text += f" ({activity['duration']} min)"
+    pdf.text(x + TIME_WIDTH, y + 1, latin1(label), align='right')
+    text_x = x + TIME_WIDTH + 6
+    pdf.text(text_x, y + 1, fit(text, x + COLUMN_WIDTH - text_x - 2))
+
+
+def generate_full_schedule_pdf(schedule_data: Schedule, user_data: UserData, output=None):
+    """Draw every day of the schedule on a fixed grid; returns the output stream
+
+    output is any writable binary file object (default a new BytesIO); it
+    only needs write(), so pages can go straight to a file or socket. A day
+    that does not fit in what is left of a column starts the next column,
+    and a day longer than a whole column continues with a '(cont.)' heading.
+    """
+    buffer = output if output is not None else BytesIO()
+    pdf = PDFStream(buffer)
+    courses = user_data.get('courses', [])
+    deadlines = user_data.get('deadlines', [])
+    dates = list(schedule_data)
+    span = f'{dates[0]} to {dates[-1]}' if dates else 'no days planned'
+    subtitle = latin1(f"{span}  |  {len(courses)} courses  |  {len(deadlines)} deadlines  |  "
+                      f"{user_data.get('attention_span', 25)}-minute focus blocks")
+    grid = _Grid(pdf, 'StudyFlow Schedule', subtitle)
+
+    for date_str, activities in schedule_data.items():
+        heading = datetime.strptime(date_str, '%Y-%m-%d').strftime('%A, %B %d, %Y')
+        needed = 1 + len(activities)
+        if grid.remaining() < min(needed, ROWS_PER_COLUMN):
+            grid.next_column()
+        _draw_day_heading(pdf, grid, heading)
+        for activity in activities:
+            if grid.remaining() == 0:
+                grid.next_column()
+                _draw_day_heading(pdf, grid, f'{heading} (cont.)')
+            _draw_activity(pdf, grid, activity)
+        grid.skip(DAY_GAP_ROWS)
+
+    if not grid.page:
+        grid.next_column()
+    pdf.close()
+    if output is None:
+        buffer.seek(0)
+    return buffer
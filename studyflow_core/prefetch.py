@@ -0,0 +1,151 @@
+"""Build exports in the background as soon as a schedule is generated
+
+ExportPrefetcher runs export builds on a small, bounded thread pool, so the
+Streamlit script can render step 3 straight away and pick up the PDF, ICS
+and JSON once they are done. Finished artifacts land in the shared export
+cache under the same keys cached_export() uses. Work submitted for a key
+that is already cached or already in flight is not repeated, and when the
+backlog reaches max_queued new work is refused; those exports then fall
+back to being built on demand.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import get_shared_export_cache
+from .exports import EXPORTERS, export_key
+
+EXPORT_WORKERS = int(os.environ.get('STUDYFLOW_EXPORT_WORKERS', '2'))
+MAX_QUEUED_EXPORTS = int(os.environ.get('STUDYFLOW_EXPORT_QUEUE', '32'))
+PREFETCH_KINDS = ('pdf', 'ics', 'json')
+
+
+class ExportPrefetcher:
+    """Bounded thread pool that fills the export cache ahead of downloads"""
+
+    def __init__(self, workers=EXPORT_WORKERS, max_queued=MAX_QUEUED_EXPORTS, cache=None):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.cache = cache if cache is not None else get_shared_export_cache()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='studyflow-export') if workers else None
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.ready_hits = 0
+        self.waited = 0
+        self.built_on_demand = 0
+
+    def _build(self, key, kind, schedule, user_data):
+        with self._lock:
+            self.running += 1
+        try:
+            self.cache.get_or_build(key, lambda: EXPORTERS[kind](schedule, user_data))
+            with self._lock:
+                self.completed += 1
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self._futures.pop(key, None)
+
+    def prefetch(self, schedule, user_data, kinds=PREFETCH_KINDS):
+        """Queue builds for the given export kinds; returns how many were queued"""
+        if self._pool is None:
+            return 0
+        # Freeze the inputs so later edits in the session can't leak into a queued build. A
+        # LazySchedule copies only its inputs; its days are generated by the worker
+        snapshot = schedule.copy() if hasattr(schedule, 'copy') else dict(schedule.items())
+        user_data = dict(user_data)
+        queued = 0
+        for kind in kinds:
+            key = export_key(kind, snapshot, user_data)
+            with self._lock:
+                if key in self._futures or key in self.cache:
+                    continue
+                if len(self._futures) >= self.max_queued:
+                    self.rejected += 1
+                    continue
+                self._futures[key] = self._pool.submit(self._build, key, kind, snapshot, user_data)
+                self.submitted += 1
+                queued += 1
+        return queued
+
+    def pending(self, kind, schedule, user_data):
+        """True while a build for this export is queued or running"""
+        with self._lock:
+            return export_key(kind, schedule, user_data) in self._futures
+
+    def ready(self, kind, schedule, user_data):
+        """True once this export is in the cache"""
+        return export_key(kind, schedule, user_data) in self.cache
+
+    def result(self, kind, schedule, user_data, timeout=None):
+        """Return the export, waiting for a queued build or building it here if none is queued"""
+        key = export_key(kind, schedule, user_data)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self.waited += 1
+            elif key in self.cache:
+                self.ready_hits += 1
+            else:
+                self.built_on_demand += 1
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+        return self.cache.get_or_build(key, lambda: EXPORTERS[kind](schedule, user_data))
+
+    def stats(self):
+        """Return pool and queue counters suitable for logging or a monitoring endpoint
+
+        hit_rate is the share of result() calls that found the export
+        already built or being built, rather than building it there.
+        """
+        with self._lock:
+            in_flight = len(self._futures)
+            served = self.ready_hits + self.waited + self.built_on_demand
+            return {
+                'workers': self.workers,
+                'max_queued': self.max_queued,
+                'in_flight': in_flight,
+                'running': self.running,
+                'queue_depth': in_flight - self.running,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'ready_hits': self.ready_hits,
+                'waited': self.waited,
+                'built_on_demand': self.built_on_demand,
+                'hit_rate': (self.ready_hits + self.waited) / served if served else 0.0,
+            }
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+
+
+_shared_prefetcher = None
+_shared_prefetcher_lock = threading.Lock()
+
+
+def get_export_prefetcher():
+    """Return the process-wide prefetcher shared by every session
+
+    Pool size comes from STUDYFLOW_EXPORT_WORKERS (default 2, 0 disables
+    prefetching) and the backlog cap from STUDYFLOW_EXPORT_QUEUE (default 32).
+    """
+    global _shared_prefetcher
+    with _shared_prefetcher_lock:
+        if _shared_prefetcher is None:
+            _shared_prefetcher = ExportPrefetcher()
+        return _shared_prefetcher
@@ -0,0 +1,537 @@
+"""Schedule generation from parsed courses, deadlines and preferences"""
+import os
+import threading
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping
+from datetime import date as date_type, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Optional
+
+from .allocation import StudyPlan
+from .busy import busy_blocks_for, index_busy_blocks
+from .compact import CompactSchedule
+from .determinism import derive_seed, seeded_random
+from .intervals import FreeTime, activity_interval
+from .schema import Course, Deadline, Preferences, Schedule
+from .timemodel import MINUTES_PER_DAY, bedtime_minutes, format_minutes, minutes
+
+# Default number of days planned, and how many generated days a LazySchedule keeps
+HORIZON_DAYS = int(os.environ.get('STUDYFLOW_HORIZON_DAYS', '30'))
+CACHE_DAYS = int(os.environ.get('STUDYFLOW_SCHEDULE_CACHE_DAYS', '62'))
+MAX_HORIZON_DAYS = 366
+
+# Study session start times per schedule type
+STUDY_SLOTS = {
+    'intense': [minutes(10), minutes(14), minutes(16), minutes(19, 30), minutes(21)],
+    'balanced': [minutes(10), minutes(14), minutes(16), minutes(19, 30)],
+    'chill': [minutes(10), minutes(14), minutes(19, 30)],
+}
+
+
+def make_activity(start, activity, activity_type, emoji, duration, **extra):
+    """Build an activity dict; 'time' is the display label kept for compatibility"""
+    item = {
+        'start': start,
+        'time': format_minutes(start),
+        'activity': activity,
+        'type': activity_type,
+        'emoji': emoji,
+        'duration': duration,
+    }
+    item.update(extra)
+    return item
+
+
+def index_deadlines(deadlines):
+    """Group deadlines by their YYYY-MM-DD date"""
+    deadlines_by_date = defaultdict(list)
+    for deadline in deadlines:
+        deadlines_by_date[deadline['date']].append(deadline)
+    return deadlines_by_date
+
+
+SESSION_TYPES = ['Review', 'Practice', 'Reading', 'Problems', 'Notes']
+
+# Preference values assumed when a field is missing
+PREFERENCE_DEFAULTS = {
+    'wake_time': 8,
+    'sleep_time': 11,
+    'schedule_type': '⚖️ Balanced',
+    'attention_span': 25,
+    'include_breaks': True,
+}
+
+# Evening free time may be shortened to fit before bedtime, but not below this
+MIN_EVENING_MINUTES = 30
+# A meal that can't be had within this many minutes of its usual time is skipped
+MAX_MEAL_SHIFT = 90
+
+
+def _schedule_kind(schedule_type):
+    if '🔥 Intense' in schedule_type:
+        return 'intense'
+    if '⚖️ Balanced' in schedule_type:
+        return 'balanced'
+    return 'chill'
+
+
+@lru_cache(maxsize=64)
+def _compile_templates(settings):
+    preferences = dict(settings)
+    wake_time = preferences['wake_time']
+    window = (minutes(wake_time), min(bedtime_minutes(preferences['sleep_time']), MINUTES_PER_DAY))
+    templates = []
+    for is_weekend in (False, True):
+        # Reduce study sessions on weekends
+        study_slots = STUDY_SLOTS[_schedule_kind(preferences['schedule_type'])]
+        if is_weekend:
+            study_slots = study_slots[:-1]
+            evening = [make_activity(minutes(20), '🎉 Weekend Social Time', 'free', '🎉', 180)]
+        else:
+            evening = [make_activity(minutes(21), '🎮 Gaming/Netflix', 'free', '🎮', 120)]
+        templates.append({
+            'window': window,
+            'routine': (make_activity(minutes(wake_time), '🌅 Morning Routine', 'routine', '🌅', 60),),
+            'meals': (
+                make_activity(minutes(wake_time + 1), '🥞 Breakfast', 'meal', '🥞', 30),
+                make_activity(minutes(12, 30), '🍽️ Lunch Break', 'meal', '🍽️', 60),
+                make_activity(minutes(18), '🍕 Dinner', 'meal', '🍕', 60),
+            ),
+            # Social media breaks
+            'breaks': (
+                make_activity(minutes(11), '📱 Social Break', 'break', '📱', 15),
+                make_activity(minutes(15), '📱 TikTok Break', 'break', '📱', 15),
+            ) if preferences['include_breaks'] else (),
+            'evening': tuple(evening),
+            'study_slots': tuple(study_slots),
+            # Study sessions minus the per-day course and session type
+            'study': tuple(
+                make_activity(slot, None, 'study', '📚', preferences['attention_span'], course=None)
+                for slot in study_slots
+            ),
+        })
+    return tuple(templates)
+
+
+def day_templates(preferences):
+    """Return (weekday, weekend) templates compiled from the preferences
+    
+    The fixed activities and study slots depend only on the preferences, so
+    they are built once per distinct set of values and each day copies them.
+    """
+    return _compile_templates(tuple(
+        (field, preferences.get(field, default)) for field, default in PREFERENCE_DEFAULTS.items()
+    ))
+
+
+def make_study_plan(courses, deadlines, preferences, start_date):
+    """StudyPlan whose slot counts follow the preferences' schedule type"""
+    templates = day_templates(preferences)
+    return StudyPlan(courses, deadlines, lambda day: len(templates[day.weekday() >= 5]['study_slots']), start_date)
+
+
+def _place(free, template, min_duration=None, max_shift=None):
+    """Copy a template activity into the first free time that fits, or return None"""
+    placed = free.place(template['start'], template['duration'], min_duration, max_shift)
+    if placed is None:
+        return None
+    activity = dict(template)
+    start, activity['duration'] = placed
+    if start != template['start']:
+        activity['start'] = start
+        activity['time'] = format_minutes(start)
+    return activity
+
+
+def _place_all(free, templates, min_duration=None, max_shift=None):
+    placed = (_place(free, template, min_duration, max_shift) for template in templates)
+    return [activity for activity in placed if activity is not None]
+
+
+def _routine(date, date_str, context, free):
+    return [dict(activity) for activity in context['templates'][date.weekday() >= 5]['routine']]
+
+
+def _busy(date, date_str, context, free):
+    return [
+        make_activity(block['start'], f"🏫 {block['title']}", 'busy', '🏫', block['end'] - block['start'])
+        for block in busy_blocks_for(context['busy'], date, date_str)
+    ]
+
+
+def _deadline_reminders(date, date_str, context, free):
+    return [
+        make_activity(
+            minutes(23, 59), f"⚠️ DUE: {deadline['title']}", 'deadline', '⚠️', 0,
+            priority='high', course=deadline['course']
+        )
+        for deadline in context['deadlines_by_date'].get(date_str, ())
+    ]
+
+
+def _meals(date, date_str, context, free):
+    return _place_all(free, context['templates'][date.weekday() >= 5]['meals'], max_shift=MAX_MEAL_SHIFT)
+
+
+def _study(date, date_str, context, free):
+    # Study sessions go into free time nearest their template slot; courses come from the allocation plan
+    template = context['templates'][date.weekday() >= 5]
+    rng = seeded_random('schedule', context['seed'], date_str)
+    sessions = []
+    for base, course in zip(template['study'], context['plan'].courses_for(date)):
+        session_type = rng.choice(SESSION_TYPES)
+        session = _place(free, base)
+        if session is None:
+            continue
+        session['activity'] = f"📚 {course['code']} - {session_type}"
+        session['course'] = course['code']
+        sessions.append(session)
+    return sessions
+
+
+def _breaks(date, date_str, context, free):
+    return _place_all(free, context['templates'][date.weekday() >= 5]['breaks'])
+
+
+def _evening(date, date_str, context, free):
+    return _place_all(free, context['templates'][date.weekday() >= 5]['evening'], MIN_EVENING_MINUTES)
+
+
+# Each part of a day, the preference fields it reads, and whether it is
+# placed into free time. Fixed parts come first; placed parts are fitted in
+# this order between wake_time and bedtime around everything before them, so
+# they are rebuilt together whenever any part of the day changes.
+DAY_COMPONENTS = [
+    ('routine', ('wake_time',), _routine, False),
+    ('busy', ('busy_blocks',), _busy, False),
+    ('deadlines', (), _deadline_reminders, False),
+    ('meals', ('wake_time', 'sleep_time'), _meals, True),
+    ('study', ('schedule_type', 'attention_span', 'wake_time', 'sleep_time'), _study, True),
+    ('breaks', ('include_breaks', 'wake_time', 'sleep_time'), _breaks, True),
+    ('evening', ('wake_time', 'sleep_time'), _evening, True),
+]
+PLACED_COMPONENTS = frozenset(name for name, _, _, placed in DAY_COMPONENTS if placed)
+PREFERENCE_FIELDS = tuple(PREFERENCE_DEFAULTS) + ('busy_blocks',)
+
+
+def generate_components(date, context, names=None, previous=None):
+    """Return {component name: activities} for one day
+    
+    With names, only those components (plus every placed component) are
+    rebuilt and the rest are taken from previous.
+    """
+    if isinstance(date, datetime):
+        date = date.date()
+    date_str = date.isoformat()
+    components = dict(previous or {})
+    rebuild = None if names is None else set(names) | PLACED_COMPONENTS
+    free = None
+    for name, _, build, placed in DAY_COMPONENTS:
+        if placed and free is None:
+            window = context['templates'][date.weekday() >= 5]['window']
+            busy = [activity_interval(activity) for other, _, _, other_placed in DAY_COMPONENTS
+                    if not other_placed for activity in components.get(other, ())]
+            free = FreeTime(window[0], window[1], busy)
+        if rebuild is None or name in rebuild:
+            components[name] = build(date, date_str, context, free)
+    return components
+
+
+def merge_components(components):
+    """Combine a day's components into one list sorted by start minute"""
+    daily_schedule = []
+    for name, _, _, _ in DAY_COMPONENTS:
+        daily_schedule.extend(components.get(name, ()))
+    # Sort by start minute; no time labels are parsed
+    daily_schedule.sort(key=itemgetter('start'))
+    return daily_schedule
+
+
+def generate_instant_schedule(courses: List[Course], deadlines: List[Deadline], preferences: Preferences,
+                              seed: object = None, start_date: Optional[date_type] = None,
+                              days: int = HORIZON_DAYS, compact: bool = False) -> Schedule:
+    """Generate a beautiful, realistic schedule instantly
+    
+    Session picks are seeded per day from the courses and deadlines (or seed,
+    if given), so the same inputs and start date always produce the same
+    schedule, and changing a preference never reshuffles unrelated sessions.
+    Meals, study sessions, breaks and free time are fitted between wake_time
+    and sleep_time around the routine and any preferences['busy_blocks'].
+    With compact=True the days are packed into a CompactSchedule as they are
+    generated, which keeps long horizons small in memory.
+    """
+    schedule = CompactSchedule() if compact else {}
+    if seed is None:
+        seed = derive_seed(courses, deadlines)
+    start_date = start_date or datetime.now()
+    if isinstance(start_date, datetime):
+        start_date = start_date.date()
+    
+    # Index deadlines and compile the day templates once, not per day
+    context = {
+        'plan': make_study_plan(courses, deadlines, preferences, start_date),
+        'deadlines_by_date': index_deadlines(deadlines),
+        'templates': day_templates(preferences),
+        'busy': index_busy_blocks(preferences.get('busy_blocks')),
+        'seed': seed,
+    }
+    
+    # Generate the next `days` days
+    for i in range(days):
+        date = start_date + timedelta(days=i)
+        date_str = date.isoformat()
+        daily_schedule = merge_components(generate_components(date, context))
+        if compact:
+            schedule.append_day(date_str, daily_schedule)
+        else:
+            schedule[date_str] = daily_schedule
+    
+    return schedule
+
+
+def horizon_through(deadlines, start_date, minimum=HORIZON_DAYS):
+    """Days needed to cover the last deadline from start_date, at least minimum"""
+    start = start_date.date() if isinstance(start_date, datetime) else start_date
+    days = minimum
+    for deadline in deadlines:
+        try:
+            offset = (date_type.fromisoformat(deadline['date']) - start).days + 1
+        except (KeyError, TypeError, ValueError):
+            continue
+        days = max(days, offset)
+    return min(days, MAX_HORIZON_DAYS)
+
+
+class LazySchedule(Mapping):
+    """Schedule over a date horizon whose days are generated on first access
+    
+    Reads like the date -> activity list dict generate_instant_schedule
+    returns, with identical days for identical inputs, but only the days
+    actually read are built. The most recently used cache_days of them are
+    kept. items() streams day by day, so exporters never hold the whole
+    horizon at once.
+    
+    Days are cached per component (see DAY_COMPONENTS). update_preferences()
+    rebuilds only the components whose preference fields changed, and locked
+    days are never rebuilt. day_fingerprint() identifies a day's content, so
+    per-day derived data stays valid for days an edit did not touch;
+    fingerprint() identifies the whole schedule from its inputs without
+    generating any day.
+    """
+
+    def __init__(self, courses, deadlines, preferences, seed=None, start_date=None, days=HORIZON_DAYS,
+                 cache_days=CACHE_DAYS):
+        # Copies, so later edits to the caller's data can't change days not yet generated
+        self.courses = list(courses)
+        self.deadlines = list(deadlines)
+        self.preferences = dict(preferences)
+        self.inputs_key = derive_seed(courses, deadlines)
+        self.seed = self.inputs_key if seed is None else seed
+        start_date = start_date or datetime.now()
+        self.start_date = start_date.date() if isinstance(start_date, datetime) else start_date
+        self.days = days
+        self.cache_days = cache_days
+        self.hits = 0
+        self.misses = 0
+        self._deadlines_by_date = index_deadlines(deadlines)
+        self._busy = index_busy_blocks(self.preferences.get('busy_blocks'))
+        self.plan = make_study_plan(self.courses, deadlines, self.preferences, self.start_date)
+        # date string -> {'components', 'activities', 'fingerprint'}
+        self._cache = OrderedDict()
+        self._locked = {}
+        # Locked days frozen under earlier preferences, whose content the inputs no longer give
+        self._diverged = set()
+        self._fingerprint = None
+        self._lock = threading.RLock()
+
+    def _context(self):
+        return {
+            'plan': self.plan,
+            'deadlines_by_date': self._deadlines_by_date,
+            'templates': day_templates(self.preferences),
+            'busy': self._busy,
+            'seed': self.seed,
+        }
+
+    def _offset(self, date_str):
+        try:
+            offset = (date_type.fromisoformat(date_str) - self.start_date).days
+        except (TypeError, ValueError):
+            return None
+        return offset if 0 <= offset < self.days else None
+
+    def _entry(self, value):
+        """Cached entry for a date, generating it if needed; call with the lock held"""
+        if isinstance(value, str):
+            value = date_type.fromisoformat(value)
+        elif isinstance(value, datetime):
+            value = value.date()
+        date_str = value.isoformat()
+        entry = self._locked.get(date_str)
+        if entry is not None:
+            return entry
+        entry = self._cache.get(date_str)
+        if entry is not None:
+            self.hits += 1
+            self._cache.move_to_end(date_str)
+            return entry
+        self.misses += 1
+        components = generate_components(value, self._context())
+        entry = {'components': components, 'activities': merge_components(components), 'fingerprint': None}
+        self._cache[date_str] = entry
+        while len(self._cache) > self.cache_days:
+            self._cache.popitem(last=False)
+        return entry
+
+    def day(self, value):
+        """Activities for any date (date, datetime or YYYY-MM-DD), inside the horizon or not"""
+        with self._lock:
+            return self._entry(value)['activities']
+
+    def day_fingerprint(self, value):
+        """Content hash of a day's activities; unchanged days keep their fingerprint"""
+        with self._lock:
+            entry = self._entry(value)
+            if entry['fingerprint'] is None:
+                entry['fingerprint'] = '%016x' % derive_seed(entry['activities'])
+            return entry['fingerprint']
+
+    def fingerprint(self):
+        """Hash of the inputs every day is generated from, plus any locked day they no longer give
+
+        Identical inputs give identical days, so this identifies the whole
+        schedule without generating it. Locking a day doesn't change its
+        content, so only locked days that a later update_preferences() left
+        behind are hashed. Memoized until the preferences change or one of
+        those days is unlocked.
+        """
+        with self._lock:
+            if self._fingerprint is None:
+                locked = [(date_str, self.day_fingerprint(date_str)) for date_str in sorted(self._diverged)]
+                self._fingerprint = '%016x' % derive_seed(
+                    self.inputs_key, self.seed, self.preferences, self.start_date, self.days, locked
+                )
+            return self._fingerprint
+
+    def copy(self):
+        """Schedule with the same inputs and locked days that later edits to this one don't affect
+
+        Only the inputs are copied; the copy generates its own days.
+        """
+        with self._lock:
+            clone = LazySchedule(self.courses, self.deadlines, self.preferences, self.seed, self.start_date,
+                                 self.days, self.cache_days)
+            # Locked entries are never modified in place, only replaced
+            clone._locked = dict(self._locked)
+            clone._diverged = set(self._diverged)
+            clone._fingerprint = self._fingerprint
+            return clone
+
+    def lock_day(self, value):
+        """Freeze a day as it is now; later preference updates leave it untouched"""
+        with self._lock:
+            entry = self._entry(value)
+            date_str = value if isinstance(value, str) else value.strftime('%Y-%m-%d')
+            self._cache.pop(date_str, None)
+            self._locked[date_str] = entry
+
+    def unlock_day(self, value):
+        """Release a locked day; it is regenerated from current preferences when next read"""
+        date_str = value if isinstance(value, str) else value.strftime('%Y-%m-%d')
+        with self._lock:
+            self._locked.pop(date_str, None)
+            if date_str in self._diverged:
+                # Regenerated from current preferences, so its content changes
+                self._diverged.discard(date_str)
+                self._fingerprint = None
+
+    def is_locked(self, value):
+        date_str = value if isinstance(value, str) else value.strftime('%Y-%m-%d')
+        return date_str in self._locked
+
+    def locked_days(self):
+        return sorted(self._locked)
+
+    def same_inputs(self, courses, deadlines):
+        """True when courses and deadlines match the ones this schedule was built from"""
+        return derive_seed(courses, deadlines) == self.inputs_key
+
+    def update_preferences(self, preferences, days=None):
+        """Apply new preferences, rebuilding only the affected components of cached days
+        
+        Returns the names of the components that were rebuilt.
+        """
+        preferences = dict(preferences)
+        changed = {field for field in PREFERENCE_FIELDS if preferences.get(field) != self.preferences.get(field)}
+        affected = {name for name, fields, _, _ in DAY_COMPONENTS if changed.intersection(fields)}
+        if affected:
+            affected |= PLACED_COMPONENTS
+        with self._lock:
+            if days is not None:
+                self.days = days
+            self.preferences = preferences
+            self._fingerprint = None
+            if 'busy_blocks' in changed:
+                self._busy = index_busy_blocks(preferences.get('busy_blocks'))
+            if 'schedule_type' in changed:
+                # Slot counts changed, so the allocation is replanned from the start
+                self.plan = make_study_plan(self.courses, self.deadlines, self.preferences, self.start_date)
+            if affected:
+                self._diverged.update(self._locked)
+                context = self._context()
+                # The plan extends in date order, so rebuild cached days in order
+                for date_str in sorted(self._cache):
+                    entry = self._cache[date_str]
+                    entry['components'] = generate_components(
+                        date_type.fromisoformat(date_str), context, affected, entry['components']
+                    )
+                    entry['activities'] = merge_components(entry['components'])
+                    entry['fingerprint'] = None
+        return sorted(affected)
+
+    def iter_days(self, start=None, stop=None):
+        """Yield (date string, activities) for start <= date < stop, defaulting to the horizon"""
+        current = start or self.start_date
+        if isinstance(current, datetime):
+            current = current.date()
+        stop = stop or self.start_date + timedelta(days=self.days)
+        if isinstance(stop, datetime):
+            stop = stop.date()
+        while current < stop:
+            yield current.isoformat(), self.day(current)
+            current += timedelta(days=1)
+
+    def __getitem__(self, date_str):
+        if self._offset(date_str) is None:
+            raise KeyError(date_str)
+        return self.day(date_str)
+
+    def __contains__(self, date_str):
+        return self._offset(date_str) is not None
+
+    def __iter__(self):
+        for offset in range(self.days):
+            yield (self.start_date + timedelta(days=offset)).isoformat()
+
+    def __len__(self):
+        return self.days
+
+    def items(self):
+        return self.iter_days()
+
+    def to_dict(self):
+        """Materialize the whole horizon as a plain dict, e.g. for JSON export"""
+        return dict(self.iter_days())
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'days': self.days,
+                'cached_days': len(self._cache),
+                'locked_days': len(self._locked),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
@@ -0,0 +1,66 @@
+"""Shapes of the plain dicts passed between parsing, scheduling and exports
+
+Everything stays a dict so saved JSON and session state round-trip
+unchanged; these TypedDicts only document the keys for type checkers.
+"""
+from typing import List, Mapping, TypedDict
+
+
+class Course(TypedDict):
+    code: str
+    name: str
+    difficulty: int
+    credits: int
+
+
+class _DeadlineRequired(TypedDict):
+    id: str
+    title: str
+    date: str
+
+
+class Deadline(_DeadlineRequired, total=False):
+    type: str
+    course: str
+    priority: str
+
+
+class BusyBlock(TypedDict, total=False):
+    title: str
+    start: int
+    end: int
+    date: str
+    weekday: int
+
+
+class Preferences(TypedDict, total=False):
+    wake_time: int
+    sleep_time: int
+    schedule_type: str
+    attention_span: int
+    include_breaks: bool
+    busy_blocks: List[BusyBlock]
+
+
+class UserData(Preferences, total=False):
+    courses: List[Course]
+    deadlines: List[Deadline]
+    horizon_days: int
+
+
+class _ActivityRequired(TypedDict):
+    start: int
+    time: str
+    activity: str
+    type: str
+    emoji: str
+    duration: int
+
+
+class Activity(_ActivityRequired, total=False):
+    priority: str
+    course: str
+
+
+# Dict, LazySchedule or CompactSchedule keyed by 'YYYY-MM-DD'
+Schedule = Mapping[str, List[Activity]]
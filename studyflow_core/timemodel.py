@@ -0,0 +1,62 @@
+"""Minute-of-day times for schedule activities
+
+Activities carry an integer 'start' (minutes after midnight) and a
+'duration' in minutes. Sorting, overlap checks and exports work on those
+integers; the '7:30 PM' label is only produced for display, and is also kept
+on each activity as the 'time' field older saved schedules expect.
+"""
+import re
+
+MINUTES_PER_DAY = 24 * 60
+
+_TIME_LABEL = re.compile(r'^\s*(1[0-2]|0?[1-9]):([0-5]\d)\s*([AaPp])\.?[Mm]\.?\s*$')
+
+
+def minutes(hour, minute=0):
+    """Return minutes after midnight for a 24-hour clock time"""
+    return hour * 60 + minute
+
+
+def format_minutes(start):
+    """Format minutes after midnight as a 12-hour label like '7:30 PM'"""
+    hour, minute = divmod(start % MINUTES_PER_DAY, 60)
+    suffix = 'AM' if hour < 12 else 'PM'
+    return f'{(hour - 1) % 12 + 1}:{minute:02d} {suffix}'
+
+
+def parse_time_label(label):
+    """Return minutes after midnight for a '7:30 PM' label, or None"""
+    match = _TIME_LABEL.match(label or '')
+    if not match:
+        return None
+    hour = int(match.group(1)) % 12
+    if match.group(3) in 'Pp':
+        hour += 12
+    return hour * 60 + int(match.group(2))
+
+
+def activity_start(activity, default=None):
+    """Start minute of an activity, parsing the 'time' label only for old schedules"""
+    start = activity.get('start')
+    if start is None:
+        start = parse_time_label(activity.get('time'))
+    return default if start is None else start
+
+
+def activity_end(activity):
+    """End minute of an activity (start + duration)"""
+    return activity_start(activity, 0) + (activity.get('duration') or 0)
+
+
+def bedtime_minutes(sleep_time):
+    """Minutes after midnight for a bedtime hour as the app asks for it
+
+    The Bedtime slider gives 10, 11 or 12 for the evening and 1 or 2 for
+    after midnight; 24-hour values (e.g. 22) are accepted as well. Times
+    after midnight come out past MINUTES_PER_DAY so they sort after evening.
+    """
+    if sleep_time <= 4:
+        return (24 + sleep_time) * 60
+    if sleep_time <= 12:
+        return (12 + sleep_time) * 60
+    return sleep_time * 60
@@ -0,0 +1,65 @@
+from datetime import date
+
+from studyflow_core import extract_deadlines, smart_parse_schedule
+from studyflow_core.deadlines import academic_year
+
+SAMPLE_SYLLABUS = """BIOLOGY 1205 - Anatomy and Physiology I Fall 2024
+Instructor: Dr. Smith, office hours Mon/Wed 2-4
+Grading weights: exams 10/20/30, labs 15%
+Week 1 (8/26): Introduction and homeostasis - reading notes
+Thursday, Sept 5: Quiz 1 on cell structure
+9/13 Lab report 1 due
+Oct 10th Midterm Exam (chapters 1-6)
+11/21/24 Lab Practical 2
+2024-12-12 Final Exam
+December 2 Project presentation
+"""
+
+
+def test_sample_syllabus():
+    courses, deadlines = smart_parse_schedule(SAMPLE_SYLLABUS, reference_date=date(2024, 8, 1))
+    assert [course['code'] for course in courses] == ['BIO1205']
+    assert [(d['date'], d['type'], d['priority'], d['title']) for d in deadlines] == [
+        ('2024-09-05', 'quiz', 'medium', 'Quiz 1 on cell structure'),
+        ('2024-09-13', 'assignment', 'medium', 'Lab report 1 due'),
+        ('2024-10-10', 'exam', 'high', 'Midterm Exam (chapters 1-6)'),
+        ('2024-11-21', 'practical', 'high', 'Lab Practical 2'),
+        ('2024-12-12', 'exam', 'high', 'Final Exam'),
+        ('2024-12-02', 'project', 'medium', 'Project presentation'),
+    ]
+    assert all(d['course'] == 'BIO1205' for d in deadlines)
+
+
+def test_named_term_ignores_reference_date():
+    first = smart_parse_schedule(SAMPLE_SYLLABUS, reference_date=date(2024, 8, 1))
+    later = smart_parse_schedule(SAMPLE_SYLLABUS, reference_date=date(2027, 3, 1))
+    assert first == later
+
+
+def test_undated_years_follow_the_academic_year():
+    courses = [{'code': 'CHEM 1101'}]
+    text = "9/13 Homework 1 due\n2/7 Exam 2\n"
+    deadlines = extract_deadlines(text, courses, date(2025, 10, 1))
+    assert [d['date'] for d in deadlines] == ['2025-09-13', '2026-02-07']
+    # Any day in the same academic year gives the same result
+    assert extract_deadlines(text, courses, date(2026, 6, 30)) == deadlines
+    assert academic_year(date(2026, 6, 30)) == academic_year(date(2025, 7, 1)) == 2025
+
+
+def test_same_title_for_two_courses_is_kept():
+    courses = [{'code': 'CHEM 1101'}, {'code': 'PHYS 1102'}]
+    deadlines = extract_deadlines("10/14 Midterm Exam\n", courses, date(2024, 9, 1))
+    deadlines += extract_deadlines("10/14 Midterm Exam\n", courses[1:], date(2024, 9, 1))
+    assert len({d['id'] for d in deadlines}) == 2
+    text = "Fall 2024\n10/14 Midterm Exam CHEM1101\n10/14 Midterm Exam PHYS1102\n"
+    assert [d['course'] for d in extract_deadlines(text, courses)] == ['CHEM 1101', 'PHYS 1102']
+
+
+def test_grading_weights_are_not_dates():
+    courses = [{'code': 'CHEM 1101'}]
+    for line in ("Midterm/Final/Homework weights 10/20/30",
+                 "Exam weights 10/20% and 30/40%",
+                 "Homework x9/13 due",
+                 "Exam ratio 1/2/3/4"):
+        assert extract_deadlines(line, courses, date(2026, 10, 1)) == [], line
+    assert [d['date'] for d in extract_deadlines("Final exam 12/10/26", courses, date(2026, 10, 1))] == ['2026-12-10']
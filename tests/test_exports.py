@@ -0,0 +1,67 @@
+import re
+from datetime import date
+from io import BytesIO
+
+import PyPDF2
+
+from benchmarks.bench_schedule import make_inputs
+from studyflow_core import (ExportCache, ExportPrefetcher, LazySchedule, generate_full_schedule_pdf,
+                            generate_ics_calendar, generate_pdf_schedule)
+
+PREFERENCES = {'wake_time': 8, 'schedule_type': '⚖️ Balanced', 'attention_span': 25, 'include_breaks': True}
+
+
+def _schedule(days=21):
+    courses, deadlines = make_inputs(40, course_count=4, span_days=days)
+    user_data = dict(PREFERENCES, courses=courses, deadlines=deadlines)
+    return LazySchedule(courses, deadlines, user_data, start_date=date.today(), days=days), user_data
+
+
+def test_ics_is_deterministic():
+    first, user_data = _schedule()
+    second, _ = _schedule()
+    assert generate_ics_calendar(first, user_data) == generate_ics_calendar(second, user_data)
+
+
+def test_ics_uids_are_unique():
+    schedule = {'2024-12-10': [
+        {'time': '11:59 PM', 'start': 1439, 'activity': '⚠️ DUE: Midterm', 'type': 'deadline', 'duration': 0,
+         'course': course}
+        for course in ('CHEM 1101', 'PHYS 1102', 'PHYS 1102')
+    ]}
+    uids = re.findall(r'^UID:(.*)$', generate_ics_calendar(schedule, {}), re.MULTILINE)
+    assert len(uids) == len(set(uids)) == 3
+
+
+def test_week_pdf_is_byte_identical():
+    first, user_data = _schedule()
+    second, _ = _schedule()
+    assert generate_pdf_schedule(first, user_data).getvalue() == generate_pdf_schedule(second, user_data).getvalue()
+
+
+def test_full_pdf_is_byte_identical_and_complete():
+    first, user_data = _schedule(days=60)
+    second, _ = _schedule(days=60)
+    data = generate_full_schedule_pdf(first, user_data).getvalue()
+    assert data == generate_full_schedule_pdf(second, user_data).getvalue()
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    text = ''.join(page.extract_text() for page in reader.pages)
+    assert len(reader.pages) > 1
+    for date_str in (first.start_date.isoformat(), list(first)[-1]):
+        heading = date.fromisoformat(date_str).strftime('%A, %B %d, %Y')
+        assert heading in text
+
+
+def test_prefetcher_counts_prefetched_results_as_hits():
+    schedule, user_data = _schedule(days=7)
+    prefetcher = ExportPrefetcher(workers=1, cache=ExportCache(16 * 1024 * 1024))
+    try:
+        prefetcher.prefetch(schedule, user_data, kinds=('ics',))
+        prefetcher.result('ics', schedule, user_data)
+        prefetcher.result('json', schedule, user_data)
+    finally:
+        prefetcher.shutdown()
+    stats = prefetcher.stats()
+    assert stats['ready_hits'] + stats['waited'] == 1
+    assert stats['built_on_demand'] == 1
+    assert stats['hit_rate'] == 0.5
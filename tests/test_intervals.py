@@ -0,0 +1,77 @@
+import random
+from itertools import combinations
+
+from studyflow_core.intervals import FreeTime, IntervalIndex, merge_intervals
+
+
+def test_merge_intervals():
+    assert merge_intervals([(5, 8), (1, 3), (2, 4), (8, 9), (10, 10)]) == [(1, 4), (5, 9)]
+
+
+def test_conflicts_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(200):
+        intervals = []
+        for index in range(rng.randint(0, 12)):
+            start = rng.randrange(0, 100)
+            intervals.append((start, start + rng.randrange(1, 30), index))
+        found = {frozenset(pair) for pair in IntervalIndex(intervals).conflicts()}
+        expected = {frozenset((a[2], b[2])) for a, b in combinations(intervals, 2) if a[0] < b[1] and b[0] < a[1]}
+        assert found == expected
+
+
+def test_place_at_preferred_time():
+    free = FreeTime(480, 1380)
+    assert free.place(600, 60) == (600, 60)
+    assert free.gaps == [(480, 600), (660, 1380)]
+
+
+def test_place_moves_to_next_gap():
+    free = FreeTime(480, 1380, busy=[(590, 700)])
+    assert free.place(600, 60) == (700, 60)
+
+
+def test_place_shrinks_to_min_duration():
+    free = FreeTime(480, 1380, busy=[(630, 700)])
+    assert free.place(600, 60, min_duration=25) == (600, 30)
+
+
+def test_place_respects_max_shift():
+    free = FreeTime(480, 1380, busy=[(500, 800)])
+    assert free.place(600, 60, max_shift=90) is None
+    assert free.gaps == [(480, 500), (800, 1380)]
+    assert free.place(600, 60, max_shift=200) == (800, 60)
+
+
+def test_place_zero_duration_reserves_nothing():
+    free = FreeTime(480, 1380)
+    assert free.place(1439, 0) == (1439, 0)
+    assert free.gaps == [(480, 1380)]
+
+
+def test_place_falls_back_to_latest_earlier_gap():
+    free = FreeTime(480, 1380, busy=[(500, 540), (900, 1380)])
+    assert free.place(1000, 60) == (840, 60)
+
+
+def test_place_uses_latest_slot_in_earlier_gap():
+    # The gap holding preferred is too short after it but long enough overall
+    free = FreeTime(480, 1380, busy=[(620, 1380)])
+    assert free.place(600, 60) == (560, 60)
+    assert free.gaps == [(480, 560)]
+
+
+def test_place_shrinks_into_gap_only_before_preferred():
+    free = FreeTime(480, 1380, busy=[(480, 540), (580, 1380)])
+    assert free.place(1000, 60) is None
+    assert free.place(600, 60, min_duration=25) == (540, 40)
+    assert free.gaps == []
+    free = FreeTime(480, 1380, busy=[(480, 540), (580, 1380)])
+    assert free.place(600, 60, min_duration=45) is None
+    assert free.place(600, 60, min_duration=25, max_shift=30) is None
+
+
+def test_place_returns_none_when_nothing_fits():
+    free = FreeTime(480, 600, busy=[(500, 560)])
+    assert free.place(480, 90) is None
+    assert free.total() == 60
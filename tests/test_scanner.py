@@ -0,0 +1,35 @@
+import random
+
+from benchmarks.bench_scanner import legacy_scan
+from benchmarks.corpus import syllabus_lines
+from studyflow_core.scanner import COURSE_PATTERN, iter_course_matches, scan_courses
+
+_PIECES = ['BIO', 'BIOLOGY', 'CHEM', 'MATH', 'cs', ' ', '  ', '-', ':', '\n', '1205', '101', '2024', '12',
+           'Anatomy and Physiology', 'Intro to things', 'Fall 2024', '*', 'due 9/13', 'PAGE 100']
+
+
+def _spans(matches):
+    return [match.span() for match in matches]
+
+
+def test_anchored_walk_matches_finditer_on_random_text():
+    rng = random.Random(1205)
+    for _ in range(2000):
+        text = ''.join(rng.choice(_PIECES) for _ in range(rng.randint(1, 30)))
+        assert _spans(iter_course_matches(text)) == _spans(COURSE_PATTERN.finditer(text)), repr(text)
+
+
+def test_anchored_walk_matches_finditer_on_corpus():
+    for courses in (1, 6):
+        text = '\n'.join(syllabus_lines(20, courses=courses))
+        assert _spans(iter_course_matches(text)) == _spans(COURSE_PATTERN.finditer(text))
+
+
+def test_biology_syllabus_parses_as_before():
+    text = '\n'.join(syllabus_lines(20))
+    assert scan_courses(text) == legacy_scan(text) == [('BIO1205', 'Biology 1205 - Anatomy and Physiology I')]
+
+
+def test_courses_keep_first_occurrence_in_order():
+    text = "CHEM 1101 - General Chemistry I\nMATH 1200 - Calculus for Scientists\nCHEM 1101 - Again and again\n"
+    assert scan_courses(text) == [('CHEM 1101', 'General Chemistry I'), ('MATH 1200', 'Calculus for Scientists')]
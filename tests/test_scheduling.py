@@ -0,0 +1,86 @@
+from datetime import date
+
+import pytest
+
+from benchmarks.bench_schedule import make_inputs
+from studyflow_core import LazySchedule, generate_instant_schedule
+
+START = date(2024, 8, 26)
+PREFERENCES = {'wake_time': 8, 'sleep_time': 11, 'schedule_type': '⚖️ Balanced', 'attention_span': 25,
+               'include_breaks': True}
+BUSY = [{'title': 'Work', 'start': 13 * 60, 'end': 17 * 60, 'weekday': 2},
+        {'title': 'Lab', 'start': 9 * 60, 'end': 11 * 60, 'date': '2024-09-03'}]
+
+
+@pytest.fixture(scope='module')
+def inputs():
+    return make_inputs(60, course_count=5, span_days=60)
+
+
+@pytest.mark.parametrize('change', [
+    {'wake_time': 7},
+    {'sleep_time': 12},
+    {'attention_span': 50},
+    {'include_breaks': False},
+    {'schedule_type': '🔥 Intense'},
+    {'busy_blocks': BUSY},
+    {'wake_time': 9, 'schedule_type': '🌿 Chill', 'busy_blocks': BUSY},
+])
+def test_update_preferences_matches_full_rebuild(inputs, change):
+    courses, deadlines = inputs
+    schedule = LazySchedule(courses, deadlines, PREFERENCES, start_date=START, days=45, cache_days=20)
+    # Read part of the horizon so some days are cached and some were evicted
+    for _, _ in zip(range(30), schedule.items()):
+        pass
+    updated = dict(PREFERENCES, **change)
+    schedule.update_preferences(updated)
+    expected = generate_instant_schedule(courses, deadlines, updated, start_date=START, days=45)
+    assert schedule.to_dict() == expected
+    assert LazySchedule(courses, deadlines, updated, start_date=START, days=45).fingerprint() == schedule.fingerprint()
+
+
+def test_lazy_schedule_matches_eager(inputs):
+    courses, deadlines = inputs
+    schedule = LazySchedule(courses, deadlines, PREFERENCES, start_date=START, days=30, cache_days=5)
+    assert schedule.to_dict() == generate_instant_schedule(courses, deadlines, PREFERENCES, start_date=START, days=30)
+    # Out-of-order reads regenerate identical days
+    assert schedule['2024-09-01'] == schedule.to_dict()['2024-09-01']
+
+
+def test_locked_day_survives_updates(inputs):
+    courses, deadlines = inputs
+    schedule = LazySchedule(courses, deadlines, PREFERENCES, start_date=START, days=14)
+    locked = schedule['2024-08-28']
+    schedule.lock_day('2024-08-28')
+    updated = dict(PREFERENCES, wake_time=10, attention_span=45)
+    schedule.update_preferences(updated)
+    assert schedule['2024-08-28'] == locked
+    assert schedule['2024-08-29'] != locked
+    schedule.unlock_day('2024-08-28')
+    fresh = generate_instant_schedule(courses, deadlines, updated, start_date=START, days=14)
+    assert schedule['2024-08-28'] == fresh['2024-08-28']
+
+
+def test_lock_changes_fingerprint_only_once_content_diverges(inputs):
+    courses, deadlines = inputs
+    schedule = LazySchedule(courses, deadlines, PREFERENCES, start_date=START, days=14)
+    before = schedule.fingerprint()
+    schedule.lock_day('2024-08-28')
+    assert schedule.fingerprint() == before
+    schedule.unlock_day('2024-08-28')
+    assert schedule.fingerprint() == before
+    updated = dict(PREFERENCES, wake_time=10)
+    schedule.lock_day('2024-08-28')
+    schedule.update_preferences(updated)
+    fresh = LazySchedule(courses, deadlines, updated, start_date=START, days=14)
+    assert schedule.fingerprint() != fresh.fingerprint()
+    assert schedule.copy().fingerprint() == schedule.fingerprint()
+    schedule.unlock_day('2024-08-28')
+    assert schedule.fingerprint() == fresh.fingerprint()
+
+
+def test_update_preferences_rebuilds_only_affected_components(inputs):
+    courses, deadlines = inputs
+    schedule = LazySchedule(courses, deadlines, PREFERENCES, start_date=START, days=7)
+    assert schedule.update_preferences(dict(PREFERENCES)) == []
+    assert 'breaks' in schedule.update_preferences(dict(PREFERENCES, include_breaks=False))